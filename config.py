@@ -4,7 +4,11 @@ Independent Hiking Trail Detection System
 """
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+from typing import Tuple
+
 
 # Application Info
 APP_NAME = "DivyaDrishti"
@@ -19,57 +23,84 @@ SAVED_VIDEOS_DIR = BASE_DIR / "saved_videos"
 LOGS_DIR = BASE_DIR / "logs"
 
 # Multi-Model Configuration
-AVAILABLE_MODELS = {
-    "foottrail": {
-        "name": "FootTrail Detection Model",
-        "description": "Custom foottrail/hiking detection",
-        "path": str(HIKING_MODEL_PATH),
-        "type": "custom",
-        "classes": ["trail", "path", "hiking_trail", "walkway", "footpath", "person", "hiker", "backpack", "tent", "camping_gear"],
-        "icon": "🥾",
-        "color": "#00ff41"
-    },
-    "yolov11n": {
-        "name": "YOLOv11n",
-        "description": "Fast general detection (nano)",
-        "path": "yolo11n.pt",
-        "type": "coco",
-        "classes": ["person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat", "traffic light"],
-        "icon": "⚡",
-        "color": "#00d4ff"
-    },
-    "yolov11s": {
-        "name": "YOLOv11s",
-        "description": "Balanced performance (small)",
-        "path": "yolo11s.pt",
-        "type": "coco",
-        "classes": ["person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat", "traffic light"],
-        "icon": "⚖️",
-        "color": "#ff8000"
-    },
-    "yolov11m": {
-        "name": "YOLOv11m",
-        "description": "High accuracy (medium)",
-        "path": "yolo11m.pt",
-        "type": "coco",
-        "classes": ["person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat", "traffic light"],
-        "icon": "🎯",
-        "color": "#ff0080"
-    },
-    "yolov11s_seg": {
-        "name": "YOLOv11s-seg",
-        "description": "Segmentation mode",
-        "path": "yolo11s-seg.pt",
-        "type": "segmentation",
-        "classes": ["person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat", "traffic light"],
-        "icon": "🎨",
-        "color": "#8000ff"
-    }
+@dataclass(frozen=True)
+class ModelSpec:
+    """Immutable description of a selectable detection model"""
+    __slots__ = ("name", "description", "path", "type", "classes", "icon", "color")
+
+    name: str
+    description: str
+    path: str
+    type: str
+    classes: Tuple[str, ...]
+    icon: str
+    color: str
+
+
+# Shared class tuples - one object referenced by every spec that uses it
+_COCO10 = (
+    "person", "bicycle", "car", "motorcycle", "airplane",
+    "bus", "train", "truck", "boat", "traffic light"
+)
+_FOOTTRAIL_CLASSES = (
+    "trail", "path", "hiking_trail", "walkway", "footpath",
+    "person", "hiker", "backpack", "tent", "camping_gear"
+)
+
+_models = {
+    "foottrail": ModelSpec(
+        name="FootTrail Detection Model",
+        description="Custom foottrail/hiking detection",
+        path=str(HIKING_MODEL_PATH),
+        type="custom",
+        classes=_FOOTTRAIL_CLASSES,
+        icon="🥾",
+        color="#00ff41"
+    ),
+    "yolov11n": ModelSpec(
+        name="YOLOv11n",
+        description="Fast general detection (nano)",
+        path="yolo11n.pt",
+        type="coco",
+        classes=_COCO10,
+        icon="⚡",
+        color="#00d4ff"
+    ),
+    "yolov11s": ModelSpec(
+        name="YOLOv11s",
+        description="Balanced performance (small)",
+        path="yolo11s.pt",
+        type="coco",
+        classes=_COCO10,
+        icon="⚖️",
+        color="#ff8000"
+    ),
+    "yolov11m": ModelSpec(
+        name="YOLOv11m",
+        description="High accuracy (medium)",
+        path="yolo11m.pt",
+        type="coco",
+        classes=_COCO10,
+        icon="🎯",
+        color="#ff0080"
+    ),
+    "yolov11s_seg": ModelSpec(
+        name="YOLOv11s-seg",
+        description="Segmentation mode",
+        path="yolo11s-seg.pt",
+        type="segmentation",
+        classes=_COCO10,
+        icon="🎨",
+        color="#8000ff"
+    )
 }
+AVAILABLE_MODELS = MappingProxyType(_models)
 
 # Default Model Settings
 DEFAULT_MODEL_KEY = "yolov11n"  # Changed to YOLOv11n for person detection
 CURRENT_MODEL = DEFAULT_MODEL_KEY
+MAX_CACHED_MODELS = 2            # Switched-out models kept initialized for fast switching back
+MODEL_CACHE_MIN_FREE_GPU = 0.2   # Drop cached models when free GPU memory falls below this fraction
 CONFIDENCE_THRESHOLD = 0.15  # Lowered for better person detection
 IOU_THRESHOLD = 0.45
 MAX_DETECTIONS = 1000
@@ -82,21 +113,61 @@ SKIP_FRAMES = 1  # Process every frame for best quality
 MAX_FPS = 30
 ENABLE_GPU = True
 DEVICE = "auto"  # "auto", "cpu", "cuda", "mps"
+TORCH_THREADS = max(1, (os.cpu_count() or 1) - 2)  # CPU inference threads - leaves cores for the Tk and capture threads
+
+# Must be in the environment before torch (and its OpenMP runtime) is first imported
+os.environ.setdefault("OMP_NUM_THREADS", str(TORCH_THREADS))
+
+
+def _resolve_device():
+    """Probe torch for the best available device"""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    if torch.cuda.is_available() and ENABLE_GPU:
+        return "cuda"
+    if hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def get_device():
+    """
+    Concrete inference device. "auto" is resolved on the first call, by the
+    detector or optimizer, and cached in DEVICE; resolving imports torch, so
+    it is kept out of `import config`.
+    """
+    global DEVICE
+    if DEVICE == "auto":
+        DEVICE = _resolve_device()
+    return DEVICE
 
 # Optimization Settings
 ENABLE_TENSORRT = True  # Enable TensorRT optimization for NVIDIA GPUs
 ENABLE_ONNX = True      # Enable ONNX optimization for CPU/other devices
-MODEL_PRECISION = "fp16"  # "fp32", "fp16", "int8" - lower precision = faster inference
+MODEL_PRECISION = "fp16"  # "fp32", "fp16", "int8", "fp8" - lower precision = faster inference
+TENSORRT_IMGSZ = 640  # Fixed input size TensorRT engines are built for
+TENSORRT_CALIB_DATA = BASE_DIR / "Models" / "calib" / "calib.yaml"  # INT8 calibration set (~200 drone-feed images)
+TENSORRT_CALIB_FRACTION = 1.0  # Share of the calibration set used for INT8 (lower = faster engine build)
 OPTIMIZE_MODELS_ON_LOAD = True  # Auto-optimize models when loading
+PANEL_SETTINGS_FILE = Path.home() / ".divyadrishti" / "opt_panel.json"  # Optimization panel choices, restored at startup
+ENABLE_TORCH_COMPILE = True  # torch.compile the detector's PyTorch model on CUDA (CUDA graphs for the live input shape)
 
 # Video Processing Optimization
 FRAME_RESIZE_ENABLED = True  # Resize frames for faster processing
 FRAME_RESIZE_WIDTH = 640     # Resize width (maintains aspect ratio)
 FRAME_RESIZE_HEIGHT = 480    # Resize height
+GPU_PREPROCESS = True        # On CUDA, color-convert/normalize resized frames on the GPU (PyTorch models)
+ENABLE_OPENCL_RESIZE = True  # Resize on the OpenCL device (cv2.UMat) when inference runs on CPU
 BATCH_PROCESSING = False     # Enable batch processing (experimental)
 BATCH_SIZE = 4              # Batch size for processing multiple frames
+INFER_BATCH = 1             # Live frames per detector call (1 = no micro-batching)
+INFER_MAX_LATENCY_MS = 50   # Max wait to fill an inference batch before flushing
 
 # Advanced Performance Settings
+OPENCV_THREADS = 1          # OpenCV worker threads - 1 avoids contention with inference threads on small frames
+ENABLE_HW_DECODE = True     # Try GStreamer/NVDEC or FFmpeg hardware decode for files and streams
 WARM_UP_ITERATIONS = 10     # Number of warm-up iterations for model
 ENABLE_HALF_PRECISION = True  # Use half precision (FP16) for faster inference
 OPTIMIZE_FOR_MOBILE = False  # Optimize for mobile/edge devices
@@ -106,6 +177,7 @@ ENABLE_DYNAMIC_BATCHING = False  # Dynamic batch sizing based on GPU memory
 SMART_FRAME_SELECTION = False  # DISABLED for tracking - breaks continuity
 FRAME_SIMILARITY_THRESHOLD = 0.95  # Threshold for frame similarity (0-1)
 ADAPTIVE_SKIP_FRAMES = False  # DISABLED for tracking - breaks continuity
+INFER_SKIP_FRAMES = 0  # With adaptive skip: frames shown with the last overlay per inference (0 = only frames still queued after inference)
 
 # GUI Settings - Modern Light Theme
 MODERN_LIGHT_THEME = {
@@ -130,15 +202,20 @@ MODERN_LIGHT_THEME = {
     "input_focus": "#80bdff"         # Input focus
 }
 
+# Name the optimization panel and utils.apply_cyberpunk_style use; same palette as the main window
+CYBERPUNK_THEME = MODERN_LIGHT_THEME
+
 # Window Settings
 WINDOW_WIDTH = 1600
 WINDOW_HEIGHT = 1000
 RESIZABLE = True
+VIDEO_DISPLAY_WIDTH = 580   # Max size of each video panel image
+VIDEO_DISPLAY_HEIGHT = 400
 
 # Drone Video Settings
 DEFAULT_DRONE_FEED = 0
 DEFAULT_STREAM_URL = "sample_video.mp4"  # Local sample video
-SUPPORTED_FORMATS = [".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv"]
+SUPPORTED_FORMATS = frozenset({".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv"})  # Lowercase extensions
 
 # Logging Settings
 LOG_DETECTIONS = True
@@ -150,6 +227,10 @@ SCREENSHOT_FORMAT = "jpg"
 SCREENSHOT_QUALITY = 95
 AUTO_SAVE_SCREENSHOTS = False
 
+# Recording Settings (Auto-Record writes processed frames to SAVED_VIDEOS_DIR)
+RECORDING_FOURCC = "avc1"     # H.264; falls back to mp4v when unavailable
+RECORDING_QUEUE_SIZE = 32     # Frames buffered ahead of the writer thread
+
 # Performance Monitoring
 MONITOR_PERFORMANCE = True
 PERFORMANCE_LOG_INTERVAL = 5  # seconds
@@ -160,10 +241,7 @@ ENABLE_POSE_ESTIMATION = False
 ENABLE_CLASSIFICATION = True
 
 # Hiking Trail Specific Settings
-TRAIL_CLASSES = [
-    "trail", "path", "hiking_trail", "walkway", "footpath",
-    "person", "hiker", "backpack", "tent", "camping_gear"
-]
+TRAIL_CLASSES = _FOOTTRAIL_CLASSES
 
 # Detection Zones (for trail-specific detection)
 DETECTION_ZONES = {
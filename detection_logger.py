@@ -5,6 +5,7 @@ Logging system for foottrail detections
 
 import csv
 import json
+import time
 from datetime import datetime
 import config
 
@@ -13,6 +14,8 @@ class DetectionLogger:
         self.log_file = config.LOGS_DIR / "foottrail_detections.csv"
         self.json_log_file = config.LOGS_DIR / "foottrail_detections.json"
         self.detections = []
+        self._ts_second = None  # Cached per-second timestamp prefix (see _timestamp)
+        self._ts_prefix = ""
         self.session_stats = {
             'session_start': datetime.now(),
             'total_detections': 0,
@@ -44,11 +47,9 @@ class DetectionLogger:
         if not config.LOG_DETECTIONS:
             return
 
-        timestamp = datetime.now()
-
         # Create log entry
         log_entry = {
-            'timestamp': timestamp.isoformat(),
+            'timestamp': self._timestamp(),
             'session_id': session_id,
             'frame_number': frame_number,
             'object_class': detection['class_name'],
@@ -72,6 +73,18 @@ class DetectionLogger:
         if len(self.detections) > config.MAX_LOG_ENTRIES:
             self.detections = self.detections[-config.MAX_LOG_ENTRIES:]
 
+    def _timestamp(self):
+        """
+        ISO-8601 timestamp for a log entry. Detections within the same second
+        share one formatted date/time prefix; only microseconds are appended.
+        """
+        now = time.time()
+        second = int(now)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_prefix = datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self._ts_prefix}.{int((now - second) * 1e6):06d}"
+
     def _update_session_stats(self, detection):
         """Update session statistics"""
         self.session_stats['total_detections'] += 1
@@ -119,24 +132,31 @@ class DetectionLogger:
         stats['session_duration'] = str(datetime.now() - stats['session_start'])
         return stats
 
+    SUMMARY_LINES = 10  # Notifications shown in the detection summary
+
     def get_detection_summary(self):
         """Get detection summary for display - simplified notifications only"""
         if not self.detections:
             return "🔍 Monitoring for detections..."
 
-        # Get recent detections (last 10)
-        recent_detections = self.detections[-10:] if len(self.detections) > 10 else self.detections
-
-        # Create simple notification lines
-        notifications = []
-        for detection in recent_detections:
-            timestamp = detection['timestamp'].split('T')[1].split('.')[0]  # Get time only
-            class_name = detection['object_class']
-            notifications.append(f"🎯 {timestamp} - {class_name} detected")
-
-        # Join notifications with newlines
-        summary = "\n".join(notifications)
-        return summary
+        # Get recent detections (last 10) as simple notification lines
+        return "\n".join(self._notification(d) for d in self.detections[-self.SUMMARY_LINES:])
+
+    def get_new_notifications(self, since_total):
+        """
+        Notification lines for detections logged after the session had
+        since_total of them (at most SUMMARY_LINES), for incremental display
+        """
+        new = self.session_stats['total_detections'] - since_total
+        if new <= 0:
+            return []
+        return [self._notification(d) for d in self.detections[-min(new, self.SUMMARY_LINES):]]
+
+    @staticmethod
+    def _notification(detection):
+        """One summary line: time of day and class"""
+        timestamp = detection['timestamp'].split('T')[1].split('.')[0]  # Get time only
+        return f"🎯 {timestamp} - {detection['object_class']} detected"
 
     def export_logs(self, export_path=None, format='csv'):
         """Export logs to file"""
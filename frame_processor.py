@@ -7,36 +7,175 @@ import cv2
 import numpy as np
 import time
 from collections import deque
-import threading
+import math
+import os
 import config
 
+# Vectorized (IPP/SIMD) kernels on, and keep OpenCV's thread pool from
+# competing with PyTorch's inference threads
+cv2.setUseOptimized(True)
+cv2.setNumThreads(config.OPENCV_THREADS)
+
+# Numba is optional - fall back to NumPy reductions when it isn't installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _centered_correlation_loop(a, b):
+    """Pearson correlation of two mean-centered 2D arrays in a single fused pass"""
+    saa = 0.0
+    sbb = 0.0
+    sab = 0.0
+    for i in range(a.shape[0]):
+        for j in range(a.shape[1]):
+            x = a[i, j]
+            y = b[i, j]
+            saa += x * x
+            sbb += y * y
+            sab += x * y
+    
+    den = math.sqrt(saa * sbb)
+    if den == 0.0:
+        # Flat frames carry no structure - only two flat frames match
+        return 1.0 if saa == 0.0 and sbb == 0.0 else 0.0
+    return sab / den
+
+
+def _centered_correlation_numpy(a, b):
+    """Pearson correlation of two mean-centered arrays using NumPy reductions"""
+    saa = float((a * a).sum())
+    sbb = float((b * b).sum())
+    den = math.sqrt(saa * sbb)
+    if den == 0.0:
+        # Flat frames carry no structure - only two flat frames match
+        return 1.0 if saa == 0.0 and sbb == 0.0 else 0.0
+    return float((a * b).sum()) / den
+
+
+if NUMBA_AVAILABLE:
+    _centered_correlation = njit(fastmath=True, cache=True, boundscheck=False, nogil=True)(
+        _centered_correlation_loop
+    )
+else:
+    _centered_correlation = _centered_correlation_numpy
+
+
+class BufferPool:
+    """
+    Reusable NumPy buffers keyed by (shape, dtype). acquire() hands out a
+    released buffer when one matches, release() returns it for reuse.
+    deque.append/pop are atomic in CPython, so producer and consumer threads
+    can share one pool without a lock.
+    """
+    
+    def __init__(self, max_per_key=8):
+        self.max_per_key = max_per_key
+        self._free = {}
+    
+    def acquire(self, shape, dtype=np.uint8):
+        """Get an uninitialized buffer of the given shape and dtype"""
+        key = (tuple(shape), np.dtype(dtype))
+        free = self._free.get(key)
+        if free:
+            try:
+                return free.pop()
+            except IndexError:
+                pass
+        return np.empty(key[0], dtype=key[1])
+    
+    def release(self, arr):
+        """Return a buffer to the pool (extra buffers are left to the GC)"""
+        if arr is None or not arr.flags.owndata:
+            return
+        key = (arr.shape, arr.dtype)
+        free = self._free.setdefault(key, deque(maxlen=self.max_per_key))
+        free.append(arr)
+    
+    def clear(self):
+        """Drop all pooled buffers"""
+        self._free.clear()
+
 
 class OptimizedFrameProcessor:
     def __init__(self):
+        # Single-producer/single-consumer buffers (capture thread appends,
+        # inference thread pops). deque.append/popleft are atomic in CPython,
+        # so no lock is taken; use queue.SimpleQueue for multiple producers.
         self.frame_buffer = deque(maxlen=config.BATCH_SIZE * 2)
         self.processed_buffer = deque(maxlen=10)
-        self.last_frame = None
+        self._last_small = None     # Centered fingerprint of last accepted frame
+        self._pending_small = None  # Fingerprint computed for the frame under test
         self.frame_similarity_cache = deque(maxlen=5)
         self.skip_counter = 0
         self.adaptive_skip = config.SKIP_FRAMES
         self.fps_history = deque(maxlen=30)
-        self.processing_lock = threading.Lock()
+        self._resize_cache = {}  # src shape -> dst size (or None if it already fits)
+        self._resize_pool = []   # Ring of resize outputs, sized in reload_config
+        self._pool_idx = 0
+        self._batch_hosts = [None, None]   # Alternating host tensors for to_model_tensor
+        self._batch_events = [None, None]  # CUDA event per host tensor: its upload finished
+        self._batch_slot = 0
+        self._opencl_available = self._probe_opencl()
+        self.reload_config()
+        self._warm_up_frame = None  # Noise frame at the processing size (see warm_up)
+        self._fps_sum = 0.0  # Running sum of fps_history for O(1) averaging
+        
+    def reload_config(self):
+        """
+        Snapshot the config values read on every frame so hot paths use
+        instance attributes instead of module lookups. Call after changing
+        any of these settings at runtime.
+        """
+        self._adaptive_enabled = config.ADAPTIVE_SKIP_FRAMES
+        self._smart_enabled = config.SMART_FRAME_SELECTION
+        self._sim_thresh = config.FRAME_SIMILARITY_THRESHOLD
+        self._max_fps = config.MAX_FPS
+        self._resize_enabled = config.FRAME_RESIZE_ENABLED
+        self._resize_w = config.FRAME_RESIZE_WIDTH
+        self._resize_h = config.FRAME_RESIZE_HEIGHT
+        self._target = (self._resize_w, self._resize_h)
+        # Offload resize to OpenCL only when the GPU isn't already busy with inference
+        self._use_opencl = (
+            config.ENABLE_OPENCL_RESIZE and config.DEVICE == "cpu" and self._opencl_available
+        )
+        self._resize_cache.clear()
         
+        # Ring of resize outputs: at least three deep so inference/overlay can
+        # still hold the previous frames, and deep enough for a full batch
+        pool_size = max(3, config.INFER_BATCH + 2)
+        if len(self._resize_pool) != pool_size:
+            self._resize_pool = [None] * pool_size
+            self._pool_idx = 0
+    
+    @staticmethod
+    def _probe_opencl():
+        """Check whether OpenCV's T-API has a usable OpenCL device"""
+        try:
+            if cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                return cv2.ocl.useOpenCL()
+        except Exception:
+            pass
+        return False
+    
     def should_process_frame(self, frame):
         """
         Determine if frame should be processed based on optimization settings
         """
         # Always process first frame
-        if self.last_frame is None:
-            self.last_frame = frame.copy()
+        if self._last_small is None:
+            self._last_small = self._frame_fingerprint(frame)
             return True
         
         # Adaptive frame skipping based on FPS
-        if config.ADAPTIVE_SKIP_FRAMES:
+        if self._adaptive_enabled:
             current_fps = self._get_current_fps()
-            if current_fps < config.MAX_FPS * 0.7:  # If FPS drops below 70% of target
+            if current_fps < self._max_fps * 0.7:  # If FPS drops below 70% of target
                 self.adaptive_skip = min(self.adaptive_skip + 1, 5)
-            elif current_fps > config.MAX_FPS * 0.9:  # If FPS is good
+            elif current_fps > self._max_fps * 0.9:  # If FPS is good
                 self.adaptive_skip = max(self.adaptive_skip - 1, 1)
         
         # Frame skipping logic
@@ -47,37 +186,47 @@ class OptimizedFrameProcessor:
         self.skip_counter = 0
         
         # Smart frame selection - skip similar frames
-        if config.SMART_FRAME_SELECTION:
-            similarity = self._calculate_frame_similarity(frame, self.last_frame)
-            if similarity > config.FRAME_SIMILARITY_THRESHOLD:
+        if self._smart_enabled:
+            similarity = self._calculate_frame_similarity(frame)
+            if similarity > self._sim_thresh:
                 return False
         
-        self.last_frame = frame.copy()
+        # Keep only the small fingerprint of the accepted frame, reusing the one
+        # from the similarity check when available - no full-frame copy needed
+        if self._pending_small is None:
+            self._pending_small = self._frame_fingerprint(frame)
+        self._last_small, self._pending_small = self._pending_small, None
         return True
     
     def optimize_frame(self, frame):
         """
         Optimize frame for faster processing
         """
-        optimized_frame = frame.copy()
+        # Fast path: capture already delivers the target size (see
+        # VideoOptimizer.optimize_capture), so there is nothing to do
+        shape = frame.shape
+        if shape[1] == self._target[0] and shape[0] == self._target[1]:
+            return frame
+        
+        # Inference does not mutate the frame, so pass it through uncopied;
+        # cv2.resize below already returns a new buffer
+        optimized_frame = frame
         
         # Resize frame if enabled
-        if config.FRAME_RESIZE_ENABLED:
-            height, width = frame.shape[:2]
-            
-            # Calculate new dimensions maintaining aspect ratio
-            if width > config.FRAME_RESIZE_WIDTH or height > config.FRAME_RESIZE_HEIGHT:
-                scale_w = config.FRAME_RESIZE_WIDTH / width
-                scale_h = config.FRAME_RESIZE_HEIGHT / height
-                scale = min(scale_w, scale_h)
-                
-                new_width = int(width * scale)
-                new_height = int(height * scale)
-                
+        if self._resize_enabled:
+            target_size = self._get_resize_target(frame.shape[:2])
+            if target_size is not None and self._use_opencl:
+                optimized_frame = cv2.resize(
+                    cv2.UMat(frame),
+                    target_size,
+                    interpolation=cv2.INTER_AREA
+                ).get()
+            elif target_size is not None:
                 optimized_frame = cv2.resize(
                     frame, 
-                    (new_width, new_height), 
-                    interpolation=cv2.INTER_LINEAR
+                    target_size, 
+                    dst=self._next_resize_buffer(target_size, frame),
+                    interpolation=cv2.INTER_AREA
                 )
         
         # Apply additional optimizations
@@ -85,37 +234,105 @@ class OptimizedFrameProcessor:
         
         return optimized_frame
     
+    def _get_resize_target(self, shape):
+        """
+        Get (width, height) to resize a frame of the given shape to, or None if
+        it already fits. Cached per source shape until reload_config().
+        """
+        try:
+            return self._resize_cache[shape]
+        except KeyError:
+            pass
+        
+        height, width = shape
+        target_size = None
+        
+        # Calculate new dimensions maintaining aspect ratio
+        if width > self._resize_w or height > self._resize_h:
+            scale_w = self._resize_w / width
+            scale_h = self._resize_h / height
+            scale = min(scale_w, scale_h)
+            target_size = (int(width * scale), int(height * scale))
+        
+        self._resize_cache[shape] = target_size
+        return target_size
+    
+    def _next_resize_buffer(self, target_size, frame):
+        """Get the next pooled output buffer, reallocating only on shape change"""
+        width, height = target_size
+        shape = (height, width) + frame.shape[2:]
+        
+        idx = self._pool_idx
+        buf = self._resize_pool[idx]
+        if buf is None or buf.shape != shape or buf.dtype != frame.dtype:
+            buf = np.empty(shape, dtype=frame.dtype)
+            self._resize_pool[idx] = buf
+        
+        self._pool_idx = (idx + 1) % len(self._resize_pool)
+        return buf
+    
     def _apply_preprocessing_optimizations(self, frame):
         """Apply preprocessing optimizations"""
         # Convert color space if needed for faster processing
         # Note: YOLO expects RGB, OpenCV uses BGR
         # This conversion is handled by ultralytics internally
         
-        # Ensure frame is contiguous in memory for faster processing
-        if not frame.flags['C_CONTIGUOUS']:
-            frame = np.ascontiguousarray(frame)
+        # Frames are contiguous by construction: VideoCapture.read() and
+        # cv2.resize (into pooled np.empty buffers) both produce C-ordered
+        # arrays, so the check only runs in debug builds
+        if __debug__:
+            assert frame.flags['C_CONTIGUOUS'], "optimize_frame expects a C-contiguous frame"
         
         return frame
     
-    def _calculate_frame_similarity(self, frame1, frame2):
+    def warm_up(self, predictor, iterations=None):
+        """
+        Run dummy inferences at the processing resolution so kernel selection
+        and workspace allocation happen before the first real frame. The frame
+        is noise rather than zeros so the pass sees image-like activations
+        and candidate boxes, and runs at least twice so anything selected on
+        the first call is settled by the second.
+        """
+        if iterations is None:
+            iterations = config.WARM_UP_ITERATIONS
+        
+        frame = self.warm_up_frame()
+        for _ in range(max(2, iterations)):
+            predictor(frame, verbose=False)
+    
+    def warm_up_frame(self):
+        """Seeded noise frame at the processing size, shared by every warm-up pass"""
+        shape = (self._resize_h, self._resize_w, 3)
+        if self._warm_up_frame is None or self._warm_up_frame.shape != shape:
+            self._warm_up_frame = np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+        return self._warm_up_frame
+    
+    def _frame_fingerprint(self, frame):
+        """
+        Strided green-channel downsample (cheap luma proxy) to roughly 64x48,
+        mean-centered. No interpolation - a single strided walk of the frame.
+        """
+        step_y = max(1, frame.shape[0] // 48)
+        step_x = max(1, frame.shape[1] // 64)
+        small = frame[::step_y, ::step_x, 1].astype(np.float32)
+        small -= small.mean()
+        return small
+    
+    def _calculate_frame_similarity(self, frame):
         """
-        Calculate similarity between two frames using histogram comparison
+        Calculate similarity between a frame and the last accepted frame using
+        Pearson correlation of their downsampled fingerprints
         """
         try:
-            # Resize frames for faster comparison
-            small_frame1 = cv2.resize(frame1, (64, 48))
-            small_frame2 = cv2.resize(frame2, (64, 48))
+            last = self._last_small
             
-            # Convert to grayscale for faster comparison
-            gray1 = cv2.cvtColor(small_frame1, cv2.COLOR_BGR2GRAY)
-            gray2 = cv2.cvtColor(small_frame2, cv2.COLOR_BGR2GRAY)
+            small = self._frame_fingerprint(frame)
+            self._pending_small = small
             
-            # Calculate histogram correlation
-            hist1 = cv2.calcHist([gray1], [0], None, [256], [0, 256])
-            hist2 = cv2.calcHist([gray2], [0], None, [256], [0, 256])
+            if small.shape != last.shape:
+                return 0.0
             
-            correlation = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
-            return correlation
+            return float(_centered_correlation(small, last))
             
         except Exception as e:
             print(f"Frame similarity calculation error: {e}")
@@ -124,26 +341,87 @@ class OptimizedFrameProcessor:
     def _get_current_fps(self):
         """Get current FPS from history"""
         if not self.fps_history:
-            return config.MAX_FPS
-        return sum(self.fps_history) / len(self.fps_history)
+            return self._max_fps
+        return self._fps_sum / len(self.fps_history)
     
     def update_fps(self, fps):
         """Update FPS history"""
+        if len(self.fps_history) == self.fps_history.maxlen:
+            self._fps_sum -= self.fps_history[0]  # Value about to be evicted
         self.fps_history.append(fps)
+        self._fps_sum += fps
     
     def prepare_batch(self, frames):
         """
-        Prepare batch of frames for batch processing
+        Prepare batch of frames for batch processing.
+        Returns a list of optimized frames (see optimize_frame); the device
+        upload for a batch is to_model_tensor.
         """
         if not config.BATCH_PROCESSING or len(frames) < 2:
             return frames
         
-        batch = []
-        for frame in frames:
-            optimized_frame = self.optimize_frame(frame)
-            batch.append(optimized_frame)
+        return [self.optimize_frame(frame) for frame in frames]
+    
+    def to_model_tensor(self, frames, stride=32):
+        """
+        Upload same-size BGR uint8 frames (already at inference size) as the
+        (N, 3, H, W) RGB tensor in [0, 1] a YOLO model consumes. The upload is
+        one async copy of the small uint8 frames from the pinned host buffer;
+        color flip, HWC->CHW, the FP16 cast and normalization run on the GPU,
+        and Ultralytics skips its CPU preprocessing for tensor input. The
+        round trip is not avoided: for tensor input Ultralytics rebuilds each
+        Results.orig_img as a uint8 numpy image, so every frame also comes back
+        as one (H, W, 3) uint8 device-to-host copy. H and W are zero-padded
+        at the bottom/right up to the model stride, so box coordinates stay in
+        the frames' own pixel space.
+        """
+        import torch
+        
+        height, width = frames[0].shape[:2]
+        host = self._get_batch_host(len(frames), height, width, torch)
+        for i, frame in enumerate(frames):
+            np.copyto(host[i].numpy(), frame)
+        
+        batch = self._upload_batch(host[:len(frames)], torch)
+        dtype = torch.half if config.ENABLE_HALF_PRECISION else torch.float32
+        tensor = batch.permute(0, 3, 1, 2).flip(1).to(dtype).div_(255.0)
+        
+        pad_h, pad_w = -height % stride, -width % stride
+        if pad_h or pad_w:
+            tensor = torch.nn.functional.pad(tensor, (0, pad_w, 0, pad_h))
+        return tensor.contiguous(memory_format=torch.channels_last)
+    
+    def _get_batch_host(self, count, height, width, torch):
+        """
+        Get the next channel-last host batch buffer. Two buffers alternate and
+        each waits on the event recorded after its last async upload, so a
+        pinned buffer is never refilled while that copy may still be in flight.
+        """
+        slot = self._batch_slot = self._batch_slot ^ 1
+        event = self._batch_events[slot]
+        if event is not None:
+            event.synchronize()
+            self._batch_events[slot] = None
         
-        return batch
+        host = self._batch_hosts[slot]
+        capacity = max(count, config.BATCH_SIZE)
+        if host is None or host.shape[0] < count or host.shape[1:3] != (height, width):
+            host = torch.empty(
+                (capacity, height, width, 3),
+                dtype=torch.uint8,
+                pin_memory=torch.cuda.is_available()
+            )
+            self._batch_hosts[slot] = host
+        return host
+    
+    def _upload_batch(self, batch, torch):
+        """Async copy of the current host buffer to the device; marks it busy until the copy runs"""
+        uploaded = batch.to(config.DEVICE, non_blocking=True)
+        if uploaded.is_cuda and batch.is_pinned():
+            event = torch.cuda.Event()
+            event.record()
+            self._batch_events[self._batch_slot] = event
+        return uploaded
     
     def get_processing_stats(self):
         """Get frame processing statistics"""
@@ -152,8 +430,8 @@ class OptimizedFrameProcessor:
             "current_fps": self._get_current_fps(),
             "frame_buffer_size": len(self.frame_buffer),
             "processed_buffer_size": len(self.processed_buffer),
-            "frame_resize_enabled": config.FRAME_RESIZE_ENABLED,
-            "smart_selection_enabled": config.SMART_FRAME_SELECTION,
+            "frame_resize_enabled": self._resize_enabled,
+            "smart_selection_enabled": self._smart_enabled,
             "batch_processing_enabled": config.BATCH_PROCESSING
         }
     
@@ -161,14 +439,83 @@ class OptimizedFrameProcessor:
         """Reset optimization parameters"""
         self.skip_counter = 0
         self.adaptive_skip = config.SKIP_FRAMES
+        self._last_small = None
+        self._pending_small = None
         self.frame_similarity_cache.clear()
         self.fps_history.clear()
+        self._fps_sum = 0.0
         print("🔄 Frame processor optimization reset")
 
 
 class VideoOptimizer:
     """Optimizes video capture settings for better performance"""
     
+    _gstreamer_available = None
+    
+    # Container demuxers for H.264 files handed to the NVDEC pipeline
+    _GST_DEMUXERS = {".mp4": "qtdemux", ".mov": "qtdemux", ".mkv": "matroskademux"}
+    
+    @classmethod
+    def _has_gstreamer(cls):
+        """Check (once) whether this OpenCV build includes the GStreamer backend"""
+        if cls._gstreamer_available is None:
+            try:
+                info = cv2.getBuildInformation()
+                cls._gstreamer_available = any(
+                    "GStreamer" in line and "YES" in line for line in info.splitlines()
+                )
+            except Exception:
+                cls._gstreamer_available = False
+        return cls._gstreamer_available
+    
+    @classmethod
+    def _build_gstreamer_pipeline(cls, source):
+        """NVDEC decode pipeline for an RTSP URL or H.264 file, or None if unsupported"""
+        sink = ("nvv4l2decoder ! nvvidconv ! video/x-raw,format=BGRx ! "
+                "videoconvert ! video/x-raw,format=BGR ! appsink drop=1 max-buffers=1")
+        
+        if source.lower().startswith("rtsp://"):
+            return f'rtspsrc location="{source}" latency=0 ! rtph264depay ! h264parse ! {sink}'
+        
+        demuxer = cls._GST_DEMUXERS.get(os.path.splitext(source)[1].lower())
+        if demuxer and os.path.isfile(source):
+            return f'filesrc location="{source}" ! {demuxer} ! h264parse ! {sink}'
+        return None
+    
+    @classmethod
+    def open_capture(cls, source):
+        """
+        Open a video source, preferring hardware decode: GStreamer + NVDEC on
+        CUDA machines, then FFmpeg with hardware acceleration, then the
+        default backend
+        """
+        if config.ENABLE_HW_DECODE and isinstance(source, str):
+            if config.get_device() == "cuda" and cls._has_gstreamer():
+                pipeline = cls._build_gstreamer_pipeline(source)
+                if pipeline is not None:
+                    cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+                    if cap.isOpened():
+                        print("📹 Using GStreamer NVDEC hardware decode")
+                        return cap
+                    cap.release()
+            
+            hw_prop = getattr(cv2, "CAP_PROP_HW_ACCELERATION", None)
+            if hw_prop is not None:
+                # OpenCV >= 4.5.2 picks the platform decoder (D3D11/VAAPI/...)
+                cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG,
+                                       [hw_prop, cv2.VIDEO_ACCELERATION_ANY])
+                if cap.isOpened():
+                    # ANY falls back to software decode when no device is usable
+                    if cap.get(hw_prop) != cv2.VIDEO_ACCELERATION_NONE:
+                        print("📹 Using FFmpeg hardware-accelerated decode")
+                    return cap
+                cap.release()
+            elif config.get_device() == "cuda":
+                # Older builds only read the hint from the environment
+                os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "hwaccel;cuda")
+        
+        return cv2.VideoCapture(source)
+    
     @staticmethod
     def optimize_capture(cap):
         """
@@ -226,44 +573,60 @@ class VideoOptimizer:
 class PerformanceProfiler:
     """Profile and analyze performance bottlenecks"""
     
+    OPERATIONS = (
+        "frame_capture",
+        "frame_optimization",
+        "model_inference",
+        "post_processing",
+        "total_pipeline"
+    )
+    WINDOW = 100  # Samples kept per operation
+    
     def __init__(self):
-        self.timings = {
-            "frame_capture": deque(maxlen=100),
-            "frame_optimization": deque(maxlen=100),
-            "model_inference": deque(maxlen=100),
-            "post_processing": deque(maxlen=100),
-            "total_pipeline": deque(maxlen=100)
-        }
+        # One preallocated ring row of nanosecond durations per operation
+        self._ops = {operation: i for i, operation in enumerate(self.OPERATIONS)}
+        self._ring = np.zeros((len(self.OPERATIONS), self.WINDOW), dtype=np.int64)
+        self._counts = [0] * len(self.OPERATIONS)  # Total samples written per row
     
     def start_timing(self, operation):
-        """Start timing an operation"""
-        return time.time()
+        """Start timing an operation (monotonic nanosecond timestamp)"""
+        return time.perf_counter_ns()
     
     def end_timing(self, operation, start_time):
-        """End timing and record"""
-        duration = time.time() - start_time
-        if operation in self.timings:
-            self.timings[operation].append(duration)
-        return duration
+        """End timing and record; returns the duration in seconds"""
+        duration_ns = time.perf_counter_ns() - start_time
+        i = self._ops.get(operation)
+        if i is not None:
+            count = self._counts[i]
+            self._ring[i, count % self.WINDOW] = duration_ns
+            self._counts[i] = count + 1
+        return duration_ns / 1e9
+    
+    @property
+    def sample_version(self):
+        """Total samples recorded so far; unchanged means the report is unchanged"""
+        return sum(self._counts)
     
     def get_performance_report(self):
         """Generate performance report"""
         report = {}
         
-        for operation, times in self.timings.items():
-            if times:
-                avg_time = sum(times) / len(times)
+        for operation, i in self._ops.items():
+            samples = min(self._counts[i], self.WINDOW)
+            if samples:
+                avg_ns = float(self._ring[i, :samples].mean())
                 report[operation] = {
-                    "avg_ms": avg_time * 1000,
-                    "fps": 1.0 / avg_time if avg_time > 0 else 0,
-                    "samples": len(times)
+                    "avg_ms": avg_ns / 1e6,
+                    "fps": 1e9 / avg_ns if avg_ns > 0 else 0,
+                    "samples": samples
                 }
         
         return report
     
-    def identify_bottlenecks(self):
-        """Identify performance bottlenecks"""
-        report = self.get_performance_report()
+    def identify_bottlenecks(self, report=None):
+        """Identify performance bottlenecks (from report, if already computed)"""
+        if report is None:
+            report = self.get_performance_report()
         bottlenecks = []
         
         for operation, stats in report.items():
@@ -278,6 +641,7 @@ class PerformanceProfiler:
 
 
 # Global instances
+buffer_pool = BufferPool()
 frame_processor = OptimizedFrameProcessor()
 video_optimizer = VideoOptimizer()
 performance_profiler = PerformanceProfiler()
@@ -5,11 +5,16 @@ Cyberpunk-themed Hiking Trail Detection System
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
 import cv2
+import queue
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor, wait
+import random
 import threading
 import time
-from datetime import datetime
-from PIL import Image, ImageTk
+import types
 import numpy as np
 
 import tempfile
@@ -17,11 +22,27 @@ import os
 
 import config
 import utils
-from object_detector import MultiModelDetector
 from detection_logger import DetectionLogger
 from performance_monitor import PerformanceMonitor
-from frame_processor import frame_processor, video_optimizer, performance_profiler
+from frame_processor import frame_processor, video_optimizer, performance_profiler, buffer_pool
 from optimization_panel import OptimizationPanel
+from video_recorder import VideoRecorder
+
+# Hot-path diagnostics go through a queue to a listener thread, so the Tk
+# and worker threads never block on console writes
+_log_q = queue.Queue(-1)
+_log = logging.getLogger("divyadrishti")
+_log.setLevel(config.LOG_LEVEL)
+_log.addHandler(logging.handlers.QueueHandler(_log_q))
+_log.propagate = False
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_q, _log_handler)
+_log_listener.start()
+
+# Capture reads are profiled on 1 in (mask + 1) frames
+_CAPTURE_KEY = "frame_capture"
+_PROFILE_SAMPLE_MASK = 31
 
 class DivyaDrishtiGUI:
     def __init__(self, root):
@@ -35,27 +56,51 @@ class DivyaDrishtiGUI:
         self.setup_modern_styling()
 
         # Initialize components
-        self.detector = MultiModelDetector()
+        self.detector = None  # Loaded in the background once the window is up (see _warmup_thread)
+        self._device_info = "Detecting device..."  # Probed with the detector load (imports torch)
         self.logger = DetectionLogger()
         self.performance_monitor = PerformanceMonitor()
         self.optimization_panel = OptimizationPanel(self.root)
 
         # Drone feed capture variables
         self.cap = None
-        self.is_running = False
+        self._running = threading.Event()
+        # Bounded stage queues: producers drop the oldest entry instead of
+        # blocking, so latency stays within a frame or two under stalls
+        self._frame_q = queue.Queue(maxsize=1)  # Capture -> detection (new per session)
+        self._display_q = queue.Queue(maxsize=2)  # Overlay -> display conversion (see _display_loop)
+        self._out_q = queue.Queue(maxsize=2)    # Display conversion -> Tk (see _on_frame_ready)
+        self._recorder = VideoRecorder()        # Auto-record, encoded on its own thread
+        self._overlay_exec = None               # Overlay drawing stage, per session (see _submit_overlay)
+        self._source_fps = config.MAX_FPS
+        self._dropped_frames = 0
+        self._warmup_done = threading.Event()
+
+        # One long-lived worker serializes model loads, switches and warm-ups
+        self._model_cmd_q = queue.Queue()
+        self._pending_switches = 0  # Touched on the Tk thread only
+        threading.Thread(target=self._model_worker, daemon=True).start()
+        self._pool = buffer_pool  # Shared with the detector's annotation buffers
         self.video_source = config.DEFAULT_DRONE_FEED
         self.confidence_threshold = config.CONFIDENCE_THRESHOLD
+        self._pending_conf = self.confidence_threshold
+        self._conf_commit_id = None
 
         # Performance tracking
-        self.fps_counter = 0
-        self.fps_start_time = time.time()
+        self.fps_counter = 0       # frame_count at the start of the current FPS window
+        self.fps_start_time = time.monotonic()
         self.current_fps = 0
+        self._stats_bar_text = (None, None)
         self.frame_count = 0
 
         # GUI state
         self.segmentation_enabled = False
         self.auto_save_enabled = config.AUTO_SAVE_SCREENSHOTS
 
+        # Persistent per-panel PhotoImages (see _show_ppm)
+        self._display_surfaces = {}
+        self._panel_sizes = {}  # Usable (width, height) per video label, from <Configure>
+
         # Drone location simulation
         self.drone_lat = 32.7767
         self.drone_lon = 74.8728
@@ -76,14 +121,134 @@ class DivyaDrishtiGUI:
         # Update model display
         self.update_model_display()
 
-        # Start GUI update loop
-        self.update_gui()
-
-        # Log system info
-        utils.log_system_info()
+        # Import/load the detector and warm it off the UI thread once the
+        # window has painted (start is gated on it)
+        self.start_button.config(state=tk.DISABLED)
+        self.update_status("⏳ Loading models...")
+        self.root.after_idle(self._deferred_init)
+
+        # Frames are pushed to the display by the display stage
+        self._display_thread = threading.Thread(target=self._display_loop, daemon=True)
+        self._display_thread.start()
+        self.root.bind('<<FrameReady>>', self._on_frame_ready)
+
+        # Start GUI update loops (detection log at ~5 Hz, stats at ~2 Hz,
+        # performance panel every 2 s)
+        self._shown_log_count = None
+        self._shown_perf = None
+        self._every(200, self._flush_logs)
+        self._every(500, self._tick_fast)
+        # Simulation keeps its 1 s step (and runs while minimized)
+        self._every(1000, self.update_drone_location)
+        self._every(2000, self._tick_slow)
+
+    def _deferred_init(self):
+        """Start the background detector load after the first paint"""
+        self._model_cmd_q.put(self._warmup_thread)
+
+    def _model_worker(self):
+        """Run queued model jobs one at a time; None stops the worker"""
+        while True:
+            cmd = self._model_cmd_q.get()
+            if cmd is None:
+                return
+            try:
+                cmd()
+            except Exception as e:
+                print(f"✗ Model worker error: {e}")
+
+    def _warmup_detector(self, iterations=3):
+        """
+        Push a few frames through detect() so cuDNN autotuning, tracker
+        setup and allocations happen before the first real frame (the same
+        seeded noise frame as frame_processor.warm_up, not zeros)
+        """
+        self._warmup_done.clear()
+        try:
+            if self.detector is not None and self.detector.is_model_loaded():
+                dummy = frame_processor.warm_up_frame()
+                for _ in range(iterations):
+                    self.detector.detect(dummy)
+                # Warm-up frames should not count towards session stats, and
+                # tracks/IDs made on them must not carry into the first session
+                self.detector.reset_stats()
+                self.detector.reset_tracking()
+                frame_processor.reset_optimization()
+        except Exception as e:
+            print(f"⚠️ Detector warm-up failed: {e}")
+        finally:
+            self._warmup_done.set()
+
+    def _warmup_thread(self):
+        """
+        Background startup: import the detector (torch/ultralytics), load the
+        default model and warm it, then re-enable the start button
+        """
+        try:
+            # Hardware overrides must land before the model is loaded and prepared
+            self.optimization_panel.apply_hardware_overrides()
+            from object_detector import MultiModelDetector
+            self.detector = MultiModelDetector()
+        except Exception as e:
+            print(f"✗ Failed to load detector: {e}")
+        # System/GPU probes import torch too, so they run here rather than
+        # before the first paint
+        try:
+            self.performance_monitor.check_gpu_availability()
+            utils.log_system_info()
+            self._device_info = utils.get_device_info()
+        except Exception as e:
+            print(f"⚠️ System info probe failed: {e}")
+            self._device_info = "CPU"
+        self._warmup_detector()
+        self.root.after(0, self._on_warmup_complete)
+
+    def _on_warmup_complete(self):
+        """Release the start button once the detector is warm"""
+        if not self.is_running:
+            self.start_button.config(state=tk.NORMAL)
+        self.device_label.config(text=f"🖥️ {self._device_info}")
+        self.update_model_display()
+        if self.detector is not None and self.detector.is_model_loaded():
+            self.update_status("🟢 System Ready")
+        else:
+            self.update_status("❌ AI detection model not loaded")
+
+    def _detector_ready(self):
+        """True once the background load has created the detector"""
+        if self.detector is None:
+            messagebox.showinfo("Please Wait", "AI models are still loading.")
+            return False
+        return True
+
+    @staticmethod
+    def _model_display_name(info):
+        """Dropdown label for a model spec"""
+        return f"{info.icon} {info.name} - {info.description}"
+
+    @property
+    def is_running(self):
+        """Whether surveillance is active (shared with worker threads)"""
+        return self._running.is_set()
+
+    @is_running.setter
+    def is_running(self, value):
+        if value:
+            self._running.set()
+        else:
+            self._running.clear()
 
     def setup_modern_styling(self):
         """Setup modern styling system for hover effects and animations"""
+        # Resolve theme colors once; widget builders and hover handlers use these
+        t = config.MODERN_LIGHT_THEME
+        self._C = types.SimpleNamespace(
+            bg=t['bg_color'], card=t['card_bg'], btn=t['button_color'],
+            hover=t['button_hover'], active=t['button_active'], text=t['text_color'],
+            primary=t['primary_color'], accent=t['accent_color'], success=t['success_color'],
+            warn=t['warning_color'], err=t['error_color'], border=t['border_color']
+        )
+
         # Configure ttk styles for modern look
         try:
             import tkinter.ttk as ttk
@@ -92,15 +257,21 @@ class DivyaDrishtiGUI:
 
             # Configure modern button style
             self.style.configure('Modern.TButton',
-                               background=config.MODERN_LIGHT_THEME["button_color"],
-                               foreground=config.MODERN_LIGHT_THEME["text_color"],
+                               background=self._C.btn,
+                               foreground=self._C.text,
                                borderwidth=1,
                                focuscolor='none',
                                relief='flat')
 
             self.style.map('Modern.TButton',
-                          background=[('active', config.MODERN_LIGHT_THEME["button_hover"]),
-                                    ('pressed', config.MODERN_LIGHT_THEME["button_active"])])
+                          background=[('active', self._C.hover),
+                                    ('pressed', self._C.active)])
+
+            # Shared card container style (one style instead of per-widget options)
+            self.style.configure('Card.TFrame',
+                               background=self._C.card,
+                               borderwidth=1,
+                               relief='solid')  # 1px border stands in for the removed shadow frames
         except:
             pass  # Fallback to standard styling
 
@@ -112,23 +283,25 @@ class DivyaDrishtiGUI:
     def add_hover_effect(self, widget, hover_bg=None, normal_bg=None, hover_fg=None, normal_fg=None):
         """Add smooth hover effects to widgets with enhanced animations"""
         if hover_bg is None:
-            hover_bg = config.MODERN_LIGHT_THEME["button_hover"]
+            hover_bg = self._C.hover
         if normal_bg is None:
-            normal_bg = config.MODERN_LIGHT_THEME["button_color"]
+            normal_bg = self._C.btn
         if hover_fg is None:
-            hover_fg = config.MODERN_LIGHT_THEME["text_color"]
+            hover_fg = self._C.text
         if normal_fg is None:
-            normal_fg = config.MODERN_LIGHT_THEME["text_color"]
+            normal_fg = self._C.text
 
-        def on_enter(event):
-            widget.configure(bg=hover_bg, fg=hover_fg, relief='raised', bd=1)
+        # Colors and the bound configure method are captured as defaults so
+        # each event is a single call with no lookups
+        def on_enter(event, configure=widget.configure, bg=hover_bg, fg=hover_fg):
+            configure(bg=bg, fg=fg, relief='raised', bd=1)
 
-        def on_leave(event):
-            widget.configure(bg=normal_bg, fg=normal_fg, relief='flat', bd=0)
+        def on_leave(event, configure=widget.configure, bg=normal_bg, fg=normal_fg):
+            configure(bg=bg, fg=fg, relief='flat', bd=0)
 
-        def on_click(event):
-            widget.configure(relief='sunken', bd=1)
-            widget.after(100, lambda: widget.configure(relief='raised', bd=1))
+        def on_click(event, configure=widget.configure):
+            configure(relief='sunken', bd=1)
+            widget.after(100, lambda: configure(relief='raised', bd=1))
 
         widget.bind("<Enter>", on_enter)
         widget.bind("<Leave>", on_leave)
@@ -142,21 +315,14 @@ class DivyaDrishtiGUI:
             'hover_fg': hover_fg
         }
 
-    def add_card_shadow_effect(self, widget):
-        """Add subtle shadow effect to card-like widgets"""
-        # Create a shadow frame behind the widget
-        shadow_frame = tk.Frame(widget.master, bg='#00000020', height=2)
-        shadow_frame.place(in_=widget, x=2, y=2, relwidth=1, relheight=1)
-        widget.lift()  # Bring widget to front
-
     def create_modern_button(self, parent, text, command=None, bg_color=None, hover_color=None, fg_color=None, **kwargs):
         """Create a modern styled button with hover effects"""
         if bg_color is None:
-            bg_color = config.MODERN_LIGHT_THEME["button_color"]
+            bg_color = self._C.btn
         if hover_color is None:
-            hover_color = config.MODERN_LIGHT_THEME["button_hover"]
+            hover_color = self._C.hover
         if fg_color is None:
-            fg_color = config.MODERN_LIGHT_THEME["text_color"]
+            fg_color = self._C.text
 
         # Remove fg from kwargs if present to avoid conflict
         kwargs.pop('fg', None)
@@ -176,10 +342,26 @@ class DivyaDrishtiGUI:
 
         return button
 
+    def create_section_header(self, parent, text, bg_color, font_size=12, pady=8):
+        """
+        Draw a colored section strip with centered title on a single Canvas
+        (one Tk widget instead of a Frame + Label pair)
+        """
+        font = ('Segoe UI', font_size, 'bold')
+        height = tkfont.Font(font=font).metrics('linespace') + 2 * pady
+
+        canvas = tk.Canvas(parent, height=height, bg=bg_color,
+                           highlightthickness=0, bd=0)
+        text_id = canvas.create_text(0, height // 2, text=text, font=font,
+                                     fill='white', anchor='center')
+        canvas.bind('<Configure>',
+                    lambda event: canvas.coords(text_id, event.width // 2, height // 2))
+        return canvas
+
     def setup_gui(self):
         """Setup the main GUI layout with modern styling"""
         # Main container with modern styling
-        main_frame = tk.Frame(self.root, bg=config.MODERN_LIGHT_THEME["bg_color"])
+        main_frame = tk.Frame(self.root, bg=self._C.bg)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
 
         # Header
@@ -199,86 +381,68 @@ class DivyaDrishtiGUI:
 
     def setup_header(self, parent):
         """Setup application header with modern styling"""
-        # Header container with card-like appearance
-        header_frame = tk.Frame(parent, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                               relief='flat', bd=1)
-        header_frame.pack(fill=tk.X, pady=(0, 20), padx=5)
-
-        # Add subtle border effect
-        border_frame = tk.Frame(header_frame, bg=config.MODERN_LIGHT_THEME["border_color"], height=1)
-        border_frame.pack(fill=tk.X, side=tk.BOTTOM)
-
-        # Content frame with padding
-        content_frame = tk.Frame(header_frame, bg=config.MODERN_LIGHT_THEME["card_bg"])
-        content_frame.pack(fill=tk.X, padx=20, pady=15)
-
-        # Title with modern typography
-        title_label = tk.Label(content_frame,
-                              text="🔍 DivyaDrishti",
-                              font=('Segoe UI', 28, 'bold'),
-                              fg=config.MODERN_LIGHT_THEME["primary_color"],
-                              bg=config.MODERN_LIGHT_THEME["card_bg"])
-        title_label.pack(side=tk.LEFT)
-
-        # Subtitle with modern styling
-        subtitle_label = tk.Label(content_frame,
-                                 text="AI Surveillance System",
-                                 font=('Segoe UI', 14),
-                                 fg=config.MODERN_LIGHT_THEME["text_color"],
-                                 bg=config.MODERN_LIGHT_THEME["card_bg"])
-        subtitle_label.pack(side=tk.LEFT, padx=(15, 0), pady=(5, 0))
-
-        # Version badge
-        version_frame = tk.Frame(content_frame, bg=config.MODERN_LIGHT_THEME["accent_color"],
-                                relief='flat')
-        version_frame.pack(side=tk.RIGHT, padx=(0, 5))
-
-        version_label = tk.Label(version_frame,
-                                text=f" v{config.APP_VERSION} ",
-                                font=('Segoe UI', 10, 'bold'),
-                                fg='white',
-                                bg=config.MODERN_LIGHT_THEME["accent_color"])
-        version_label.pack(padx=8, pady=4)
+        # The whole header is static chrome, drawn on one Canvas
+        title_font = ('Segoe UI', 28, 'bold')
+        height = tkfont.Font(font=title_font).metrics('linespace') + 30
+        mid = height // 2
+
+        header = tk.Canvas(parent, height=height, bg=self._C.card,
+                           highlightthickness=0, bd=0)
+        header.pack(fill=tk.X, pady=(0, 20), padx=5)
+
+        # Title with modern typography and subtitle beside it
+        title_id = header.create_text(20, mid, text="🔍 DivyaDrishti", anchor='w',
+                                      font=title_font, fill=self._C.primary)
+        title_right = header.bbox(title_id)[2]
+        header.create_text(title_right + 15, mid + 5, text="AI Surveillance System",
+                           anchor='w', font=('Segoe UI', 14), fill=self._C.text)
+
+        # Version badge and subtle bottom border (right-aligned, reflowed on resize)
+        badge_text = header.create_text(0, mid, text=f" v{config.APP_VERSION} ", anchor='e',
+                                        font=('Segoe UI', 10, 'bold'), fill='white')
+        badge_rect = header.create_rectangle(0, 0, 0, 0, fill=self._C.accent, outline='')
+        header.tag_lower(badge_rect, badge_text)
+        border_line = header.create_line(0, height - 1, 0, height - 1, fill=self._C.border)
+
+        def reflow(event):
+            header.coords(badge_text, event.width - 33, mid)
+            x1, y1, x2, y2 = header.bbox(badge_text)
+            header.coords(badge_rect, x1 - 8, y1 - 4, x2 + 8, y2 + 4)
+            header.coords(border_line, 0, height - 1, event.width, height - 1)
+
+        header.bind('<Configure>', reflow)
 
     def setup_control_panel(self, parent):
         """Setup control panel with modern styling"""
         # Control panel container with card styling
-        control_frame = tk.Frame(parent, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                                relief='flat', bd=1)
+        control_frame = ttk.Frame(parent, style='Card.TFrame')
         control_frame.pack(fill=tk.X, pady=(0, 20), padx=5)
 
         # Header for control panel
-        header_frame = tk.Frame(control_frame, bg=config.MODERN_LIGHT_THEME["primary_color"])
-        header_frame.pack(fill=tk.X)
-
-        header_label = tk.Label(header_frame, text="🎮 Control Panel",
-                               font=('Segoe UI', 12, 'bold'),
-                               fg='white',
-                               bg=config.MODERN_LIGHT_THEME["primary_color"])
-        header_label.pack(pady=8)
+        self.create_section_header(control_frame, "🎮 Control Panel",
+                                   self._C.primary).pack(fill=tk.X)
 
         # Main controls row with padding
-        main_controls = tk.Frame(control_frame, bg=config.MODERN_LIGHT_THEME["card_bg"])
+        main_controls = tk.Frame(control_frame, bg=self._C.card)
         main_controls.pack(fill=tk.X, padx=20, pady=15)
 
         # Model selection with modern styling
-        model_frame = tk.Frame(main_controls, bg=config.MODERN_LIGHT_THEME["card_bg"])
+        model_frame = tk.Frame(main_controls, bg=self._C.card)
         model_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 15))
 
         tk.Label(model_frame, text="🎯 Model:",
                 font=('Segoe UI', 10, 'bold'),
-                fg=config.MODERN_LIGHT_THEME["text_color"],
-                bg=config.MODERN_LIGHT_THEME["card_bg"]).pack(side=tk.LEFT, pady=5)
+                fg=self._C.text,
+                bg=self._C.card).pack(side=tk.LEFT, pady=5)
 
-        # Get model list from detector
-        model_options = [display for key, display in self.detector.get_model_list_for_gui()]
+        # Get model list from config (the detector loads in the background)
+        model_options = [self._model_display_name(info) for info in config.AVAILABLE_MODELS.values()]
         self.model_var = tk.StringVar()
 
         # Set default model
-        current_model_info = self.detector.get_current_model_info()
-        if current_model_info:
-            default_display = f"{current_model_info['icon']} {current_model_info['name']} - {current_model_info['description']}"
-            self.model_var.set(default_display)
+        default_model_info = config.AVAILABLE_MODELS.get(config.DEFAULT_MODEL_KEY)
+        if default_model_info:
+            self.model_var.set(self._model_display_name(default_model_info))
 
         model_combo = ttk.Combobox(model_frame, textvariable=self.model_var,
                                   values=model_options,
@@ -287,13 +451,13 @@ class DivyaDrishtiGUI:
         model_combo.bind("<<ComboboxSelected>>", self.on_model_change)
 
         # Drone feed source selection with modern styling
-        source_frame = tk.Frame(main_controls, bg=config.MODERN_LIGHT_THEME["card_bg"])
+        source_frame = tk.Frame(main_controls, bg=self._C.card)
         source_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(15, 15))
 
         tk.Label(source_frame, text="📹 Video Source:",
                 font=('Segoe UI', 10, 'bold'),
-                fg=config.MODERN_LIGHT_THEME["text_color"],
-                bg=config.MODERN_LIGHT_THEME["card_bg"]).pack(side=tk.LEFT, pady=5)
+                fg=self._C.text,
+                bg=self._C.card).pack(side=tk.LEFT, pady=5)
 
         self.source_var = tk.StringVar(value="Alpha Drone")
         source_combo = ttk.Combobox(source_frame, textvariable=self.source_var,
@@ -310,12 +474,12 @@ class DivyaDrishtiGUI:
         self.file_button.pack(side=tk.LEFT, padx=(10, 0))
 
         # Action buttons with modern styling
-        button_frame = tk.Frame(main_controls, bg=config.MODERN_LIGHT_THEME["card_bg"])
+        button_frame = tk.Frame(main_controls, bg=self._C.card)
         button_frame.pack(side=tk.RIGHT, padx=(15, 0))
 
         self.start_button = self.create_modern_button(button_frame, "🚀 Start Detection",
                                                      command=self.start_detection,
-                                                     bg_color=config.MODERN_LIGHT_THEME["success_color"],
+                                                     bg_color=self._C.success,
                                                      hover_color="#229954",
                                                      fg_color='white',
                                                      font=('Segoe UI', 11, 'bold'))
@@ -323,7 +487,7 @@ class DivyaDrishtiGUI:
 
         self.stop_button = self.create_modern_button(button_frame, "⏹️ Stop Detection",
                                                     command=self.stop_detection,
-                                                    bg_color=config.MODERN_LIGHT_THEME["error_color"],
+                                                    bg_color=self._C.err,
                                                     hover_color="#c0392b",
                                                     fg_color='white',
                                                     font=('Segoe UI', 11, 'bold'),
@@ -333,14 +497,14 @@ class DivyaDrishtiGUI:
         # Optimization button
         self.optimization_button = self.create_modern_button(button_frame, "⚙️ Optimize",
                                                            command=self.show_optimization_panel,
-                                                           bg_color=config.MODERN_LIGHT_THEME["accent_color"],
+                                                           bg_color=self._C.accent,
                                                            hover_color="#8e44ad",
                                                            fg_color='white',
                                                            font=('Segoe UI', 11, 'bold'))
         self.optimization_button.pack(side=tk.LEFT, padx=(0, 10))
 
         # Feature toggles row with modern styling
-        toggles_frame = tk.Frame(control_frame, bg=config.MODERN_LIGHT_THEME["card_bg"])
+        toggles_frame = tk.Frame(control_frame, bg=self._C.card)
         toggles_frame.pack(fill=tk.X, padx=20, pady=(0, 15))
 
         # AI Analysis toggle
@@ -359,8 +523,8 @@ class DivyaDrishtiGUI:
 
         # Tracking toggle
         self.tracking_enabled = config.USE_TRACKING
-        tracking_bg = config.MODERN_LIGHT_THEME["primary_color"] if self.tracking_enabled else config.MODERN_LIGHT_THEME["button_color"]
-        tracking_fg = 'white' if self.tracking_enabled else config.MODERN_LIGHT_THEME["text_color"]
+        tracking_bg = self._C.primary if self.tracking_enabled else self._C.btn
+        tracking_fg = 'white' if self.tracking_enabled else self._C.text
 
         self.tracking_button = self.create_modern_button(toggles_frame,
                                                        f"🎯 Tracking: {'ON' if self.tracking_enabled else 'OFF'}",
@@ -371,114 +535,100 @@ class DivyaDrishtiGUI:
         self.tracking_button.pack(side=tk.LEFT, padx=(0, 10))
 
         # Confidence slider with modern styling
-        confidence_frame = tk.Frame(toggles_frame, bg=config.MODERN_LIGHT_THEME["card_bg"])
+        confidence_frame = tk.Frame(toggles_frame, bg=self._C.card)
         confidence_frame.pack(side=tk.RIGHT, padx=(20, 0))
 
         tk.Label(confidence_frame, text="🎚️ Confidence:",
                 font=('Segoe UI', 10, 'bold'),
-                fg=config.MODERN_LIGHT_THEME["text_color"],
-                bg=config.MODERN_LIGHT_THEME["card_bg"]).pack(side=tk.LEFT, pady=5)
+                fg=self._C.text,
+                bg=self._C.card).pack(side=tk.LEFT, pady=5)
 
         self.confidence_var = tk.DoubleVar(value=config.CONFIDENCE_THRESHOLD)
         confidence_scale = tk.Scale(confidence_frame, from_=0.05, to=1.0,
                                   variable=self.confidence_var, orient=tk.HORIZONTAL,
                                   length=150, resolution=0.01,
-                                  bg=config.MODERN_LIGHT_THEME["card_bg"],
-                                  fg=config.MODERN_LIGHT_THEME["primary_color"],
-                                  activebackground=config.MODERN_LIGHT_THEME["primary_color"],
-                                  troughcolor=config.MODERN_LIGHT_THEME["border_color"],
+                                  bg=self._C.card,
+                                  fg=self._C.primary,
+                                  activebackground=self._C.primary,
+                                  troughcolor=self._C.border,
                                   highlightthickness=0,
-                                  relief='flat')
+                                  relief='flat',
+                                  command=self.update_confidence_label)
         confidence_scale.pack(side=tk.LEFT, padx=(10, 0))
 
         self.confidence_label = tk.Label(confidence_frame, text=f"{config.CONFIDENCE_THRESHOLD:.2f}",
                                        font=('Segoe UI', 10, 'bold'),
-                                       fg=config.MODERN_LIGHT_THEME["primary_color"],
-                                       bg=config.MODERN_LIGHT_THEME["card_bg"])
+                                       fg=self._C.primary,
+                                       bg=self._C.card)
         self.confidence_label.pack(side=tk.LEFT, padx=(8, 0))
 
-        confidence_scale.bind("<Motion>", self.update_confidence_label)
-
     def setup_video_panels(self, parent):
         """Setup video display panels with modern styling"""
-        video_frame = tk.Frame(parent, bg=config.MODERN_LIGHT_THEME["bg_color"])
+        video_frame = tk.Frame(parent, bg=self._C.bg)
         video_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
 
         # Main video feeds container with card styling
-        feeds_container = tk.Frame(video_frame, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                                  relief='flat', bd=1)
+        feeds_container = ttk.Frame(video_frame, style='Card.TFrame')
         feeds_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 15))
 
         # Left panel - Raw Video Feed
         left_frame = tk.LabelFrame(feeds_container, text="📹 Raw Video Feed",
-                                  bg=config.MODERN_LIGHT_THEME["card_bg"],
-                                  fg=config.MODERN_LIGHT_THEME["text_color"],
+                                  bg=self._C.card,
+                                  fg=self._C.text,
                                   font=('Segoe UI', 11, 'bold'))
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         self.original_label = tk.Label(left_frame, bg='black')
         self.original_label.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+        self.original_label.bind('<Configure>', self._on_panel_configure)
 
         # Right panel - AI Detection Analysis
         right_frame = tk.LabelFrame(feeds_container, text="🤖 AI Detection Analysis",
-                                   bg=config.MODERN_LIGHT_THEME["card_bg"],
-                                   fg=config.MODERN_LIGHT_THEME["text_color"],
+                                   bg=self._C.card,
+                                   fg=self._C.text,
                                    font=('Segoe UI', 11, 'bold'))
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         self.processed_label = tk.Label(right_frame, bg='black')
         self.processed_label.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+        self.processed_label.bind('<Configure>', self._on_panel_configure)
 
         # Right side - Statistics Panel
-        map_frame = tk.Frame(video_frame, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                            relief='flat', bd=1)
+        map_frame = ttk.Frame(video_frame, style='Card.TFrame')
         map_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 5))
         map_frame.config(width=300)  # Fixed width for stats panel
 
         # Detection Statistics Panel with modern styling
-        stats_header = tk.Frame(map_frame, bg=config.MODERN_LIGHT_THEME["primary_color"])
-        stats_header.pack(fill=tk.X)
-
-        stats_title = tk.Label(stats_header, text="📊 Detection Statistics",
-                              font=('Segoe UI', 12, 'bold'),
-                              fg='white',
-                              bg=config.MODERN_LIGHT_THEME["primary_color"])
-        stats_title.pack(pady=8)
+        self.create_section_header(map_frame, "📊 Detection Statistics",
+                                   self._C.primary).pack(fill=tk.X)
 
         stats_content = tk.Label(map_frame,
                                 text="Real-time YOLO\nAnalysis Dashboard\n\n🎯 Object Detection\n📈 Performance Metrics\n⚡ Live Monitoring",
                                 font=('Segoe UI', 10),
-                                fg=config.MODERN_LIGHT_THEME["text_color"],
-                                bg=config.MODERN_LIGHT_THEME["card_bg"],
+                                fg=self._C.text,
+                                bg=self._C.card,
                                 justify=tk.CENTER)
         stats_content.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
 
     def setup_info_panels(self, parent):
         """Setup information display panels with modern styling"""
-        info_frame = tk.Frame(parent, bg=config.MODERN_LIGHT_THEME["bg_color"])
+        info_frame = tk.Frame(parent, bg=self._C.bg)
         info_frame.pack(fill=tk.X, pady=(0, 20))
 
         # Detection log panel with card styling
-        log_frame = tk.Frame(info_frame, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                            relief='flat', bd=1)
+        log_frame = ttk.Frame(info_frame, style='Card.TFrame')
         log_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
 
         # Log header
-        log_header = tk.Frame(log_frame, bg=config.MODERN_LIGHT_THEME["success_color"])
-        log_header.pack(fill=tk.X)
-
-        log_title = tk.Label(log_header, text="🎯 Detection Log",
-                            font=('Segoe UI', 11, 'bold'),
-                            fg='white',
-                            bg=config.MODERN_LIGHT_THEME["success_color"])
-        log_title.pack(pady=6)
+        self.create_section_header(log_frame, "🎯 Detection Log", self._C.success,
+                                   font_size=11, pady=6).pack(fill=tk.X)
 
         # Create text widget for logs
         self.log_text = tk.Text(log_frame, height=8, wrap=tk.WORD,
-                               bg=config.MODERN_LIGHT_THEME["card_bg"],
-                               fg=config.MODERN_LIGHT_THEME["text_color"],
+                               bg=self._C.card,
+                               fg=self._C.text,
                                font=('Segoe UI', 9),
-                               insertbackground=config.MODERN_LIGHT_THEME["primary_color"],
+                               insertbackground=self._C.primary,
                                relief='flat',
                                bd=0)
 
@@ -489,25 +639,18 @@ class DivyaDrishtiGUI:
         log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
 
         # Performance panel with card styling
-        perf_frame = tk.Frame(info_frame, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                             relief='flat', bd=1)
+        perf_frame = ttk.Frame(info_frame, style='Card.TFrame')
         perf_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(10, 0))
 
         # Performance header
-        perf_header = tk.Frame(perf_frame, bg=config.MODERN_LIGHT_THEME["warning_color"])
-        perf_header.pack(fill=tk.X)
-
-        perf_title = tk.Label(perf_header, text="⚡ Performance",
-                             font=('Segoe UI', 11, 'bold'),
-                             fg='white',
-                             bg=config.MODERN_LIGHT_THEME["warning_color"])
-        perf_title.pack(pady=6)
+        self.create_section_header(perf_frame, "⚡ Performance", self._C.warn,
+                                   font_size=11, pady=6).pack(fill=tk.X)
 
         self.perf_text = tk.Text(perf_frame, height=8, wrap=tk.WORD,
-                                bg=config.MODERN_LIGHT_THEME["card_bg"],
-                                fg=config.MODERN_LIGHT_THEME["text_color"],
+                                bg=self._C.card,
+                                fg=self._C.text,
                                 font=('Segoe UI', 9),
-                                insertbackground=config.MODERN_LIGHT_THEME["primary_color"],
+                                insertbackground=self._C.primary,
                                 relief='flat',
                                 bd=0)
 
@@ -519,47 +662,53 @@ class DivyaDrishtiGUI:
 
     def setup_status_bar(self, parent):
         """Setup status bar with modern styling"""
-        status_frame = tk.Frame(parent, bg=config.MODERN_LIGHT_THEME["card_bg"],
-                               relief='flat', bd=1)
+        status_frame = ttk.Frame(parent, style='Card.TFrame')
         status_frame.pack(fill=tk.X, pady=(10, 0))
 
         # Status label with modern styling
         self.status_label = tk.Label(status_frame, text="🟢 System Ready",
                                    font=('Segoe UI', 10, 'bold'),
-                                   fg=config.MODERN_LIGHT_THEME["success_color"],
-                                   bg=config.MODERN_LIGHT_THEME["card_bg"])
+                                   fg=self._C.success,
+                                   bg=self._C.card)
         self.status_label.pack(side=tk.LEFT, padx=15, pady=8)
 
-        # Device info with modern styling
-        device_info = utils.get_device_info()
-        self.device_label = tk.Label(status_frame, text=f"🖥️ {device_info}",
+        # Device info with modern styling (filled in once the background
+        # startup has probed the device, see _on_warmup_complete)
+        self.device_label = tk.Label(status_frame, text=f"🖥️ {self._device_info}",
                                    font=('Segoe UI', 9),
-                                   fg=config.MODERN_LIGHT_THEME["accent_color"],
-                                   bg=config.MODERN_LIGHT_THEME["card_bg"])
+                                   fg=self._C.accent,
+                                   bg=self._C.card)
         self.device_label.pack(side=tk.RIGHT, padx=(10, 15), pady=8)
 
         # FPS display with modern styling
         self.fps_label = tk.Label(status_frame, text="📊 FPS: 0",
                                 font=('Segoe UI', 9),
-                                fg=config.MODERN_LIGHT_THEME["primary_color"],
-                                bg=config.MODERN_LIGHT_THEME["card_bg"])
+                                fg=self._C.primary,
+                                bg=self._C.card)
         self.fps_label.pack(side=tk.RIGHT, padx=(10, 0), pady=8)
 
         # Frame count with modern styling
         self.frame_label = tk.Label(status_frame, text="🎬 Frames: 0",
                                   font=('Segoe UI', 9),
-                                  fg=config.MODERN_LIGHT_THEME["text_color"],
-                                  bg=config.MODERN_LIGHT_THEME["card_bg"])
+                                  fg=self._C.text,
+                                  bg=self._C.card)
         self.frame_label.pack(side=tk.RIGHT, padx=(10, 0), pady=8)
 
     def on_model_change(self, event=None):
         """Handle model change"""
+        if self.detector is None:
+            self._detector_ready()
+            default_model_info = config.AVAILABLE_MODELS.get(config.DEFAULT_MODEL_KEY)
+            if default_model_info:
+                self.model_var.set(self._model_display_name(default_model_info))
+            return
+
         if self.is_running:
             messagebox.showwarning("Warning", "Please stop detection before changing models.")
             # Reset to current model
             current_model_info = self.detector.get_current_model_info()
             if current_model_info:
-                default_display = f"{current_model_info['icon']} {current_model_info['name']} - {current_model_info['description']}"
+                default_display = f"{current_model_info.icon} {current_model_info.name} - {current_model_info.description}"
                 self.model_var.set(default_display)
             return
 
@@ -573,36 +722,49 @@ class DivyaDrishtiGUI:
                 break
 
         if model_key:
-            self.update_status(f"🔄 Switching to {self.detector.available_models[model_key]['name']}...")
+            self.update_status(f"🔄 Switching to {self.detector.available_models[model_key].name}...")
+            self.start_button.config(state=tk.DISABLED)
 
-            # Switch model in a separate thread to avoid GUI freezing
-            import threading
-            def switch_model_thread():
+            # Switch on the model worker to avoid GUI freezing; queued
+            # switches run one after another, never concurrently
+            def job():
                 success = self.detector.switch_model(model_key)
                 if success:
-                    model_info = self.detector.get_current_model_info()
-                    self.update_status(f"✅ Switched to {model_info['name']}")
+                    # Each switch loads a cold model - warm it before enabling start
+                    self._warmup_detector()
+                self.root.after(0, lambda: self._post_switch(success))
 
-                    # Update status bar with new model info
-                    self.root.after(100, self.update_model_display)
-                else:
-                    self.update_status(f"❌ Failed to switch model")
-                    # Reset dropdown to previous model
-                    current_model_info = self.detector.get_current_model_info()
-                    if current_model_info:
-                        default_display = f"{current_model_info['icon']} {current_model_info['name']} - {current_model_info['description']}"
-                        self.root.after(100, lambda: self.model_var.set(default_display))
+            self._pending_switches += 1
+            self._model_cmd_q.put(job)
 
-            threading.Thread(target=switch_model_thread, daemon=True).start()
+    def _post_switch(self, success):
+        """Update the UI after a model switch (Tk thread)"""
+        if success:
+            model_info = self.detector.get_current_model_info()
+            self.update_status(f"✅ Switched to {model_info.name}")
+
+            # Update status bar with new model info
+            self.update_model_display()
+        else:
+            self.update_status(f"❌ Failed to switch model")
+            # Reset dropdown to previous model
+            current_model_info = self.detector.get_current_model_info()
+            if current_model_info:
+                self.model_var.set(self._model_display_name(current_model_info))
+
+        self._pending_switches -= 1
+        if self._pending_switches == 0 and not self.is_running:
+            self.start_button.config(state=tk.NORMAL)
 
     def update_model_display(self):
         """Update model information in the GUI"""
+        if self.detector is None:
+            return
         model_info = self.detector.get_current_model_info()
         if model_info:
             # Update device label with model info
-            device_info = utils.get_device_info()
-            model_text = f"🎯 {model_info['name']} | 🖥️ {device_info}"
-            self.device_label.config(text=model_text, fg=model_info['color'])
+            model_text = f"🎯 {model_info.name} | 🖥️ {self._device_info}"
+            self.device_label.config(text=model_text, fg=model_info.color)
 
     def on_source_change(self, event=None):
         """Handle drone feed source change"""
@@ -640,6 +802,9 @@ class DivyaDrishtiGUI:
             messagebox.showwarning("Warning", "Please stop detection before changing modes.")
             return
 
+        if not self._detector_ready():
+            return
+
         self.segmentation_enabled = not self.segmentation_enabled
         mode = "segment" if self.segmentation_enabled else "detect"
 
@@ -650,10 +815,10 @@ class DivyaDrishtiGUI:
             self.segmentation_button.config(text=button_text)
 
             if self.segmentation_enabled:
-                self.segmentation_button.config(bg=config.MODERN_LIGHT_THEME["primary_color"], fg='white')
+                self.segmentation_button.config(bg=self._C.primary, fg='white')
             else:
-                self.segmentation_button.config(bg=config.MODERN_LIGHT_THEME["button_color"],
-                                               fg=config.MODERN_LIGHT_THEME["text_color"])
+                self.segmentation_button.config(bg=self._C.btn,
+                                               fg=self._C.text)
 
             self.update_status(f"🤖 AI analysis {'enabled' if self.segmentation_enabled else 'disabled'}")
         else:
@@ -665,19 +830,26 @@ class DivyaDrishtiGUI:
     def toggle_autosave(self):
         """Toggle auto-record surveillance"""
         self.auto_save_enabled = not self.auto_save_enabled
+        if not self.auto_save_enabled:
+            self._recorder.stop()
+        elif self.is_running:
+            self._recorder.start(self._source_fps)
         button_text = f"📹 Auto-Record: {'ON' if self.auto_save_enabled else 'OFF'}"
         self.autosave_button.config(text=button_text)
 
         if self.auto_save_enabled:
-            self.autosave_button.config(bg=config.MODERN_LIGHT_THEME["primary_color"], fg='white')
+            self.autosave_button.config(bg=self._C.primary, fg='white')
         else:
-            self.autosave_button.config(bg=config.MODERN_LIGHT_THEME["button_color"],
-                                       fg=config.MODERN_LIGHT_THEME["text_color"])
+            self.autosave_button.config(bg=self._C.btn,
+                                       fg=self._C.text)
 
         self.update_status(f"📹 Auto-record {'enabled' if self.auto_save_enabled else 'disabled'}")
 
     def toggle_tracking(self):
         """Toggle object tracking for persistent annotations"""
+        if not self._detector_ready():
+            return
+
         self.tracking_enabled = not self.tracking_enabled
 
         # Update detector tracking
@@ -688,11 +860,11 @@ class DivyaDrishtiGUI:
             self.tracking_button.config(text=button_text)
 
             if self.tracking_enabled:
-                self.tracking_button.config(bg=config.MODERN_LIGHT_THEME["primary_color"], fg='white')
+                self.tracking_button.config(bg=self._C.primary, fg='white')
                 self.update_status("🎯 Object tracking enabled - persistent annotations activated")
             else:
-                self.tracking_button.config(bg=config.MODERN_LIGHT_THEME["button_color"],
-                                           fg=config.MODERN_LIGHT_THEME["text_color"])
+                self.tracking_button.config(bg=self._C.btn,
+                                           fg=self._C.text)
                 self.update_status("⚠️ Object tracking disabled - single-shot detection mode")
         else:
             self.tracking_enabled = not self.tracking_enabled  # Revert
@@ -702,25 +874,31 @@ class DivyaDrishtiGUI:
         """Show the optimization control panel"""
         self.optimization_panel.show_optimization_panel()
 
-    def update_confidence_label(self, event=None):
-        """Update confidence threshold label"""
-        value = self.confidence_var.get()
-        self.confidence_label.config(text=f"{value:.2f}")
-        self.confidence_threshold = value
+    def update_confidence_label(self, value=None):
+        """Update confidence threshold label (Scale command: fires on value change only)"""
+        if value is None:
+            value = self.confidence_var.get()
+        self._pending_conf = float(value)
+        self.confidence_label.config(text=f"{self._pending_conf:.2f}")
+
+        # Coalesce a drag into one threshold update for the detection thread
+        if self._conf_commit_id is None:
+            self._conf_commit_id = self.root.after(150, self._commit_confidence)
+
+    def _commit_confidence(self):
+        """Apply the latest slider value to detection"""
+        self._conf_commit_id = None
+        self.confidence_threshold = self._pending_conf
 
 
 
     def update_drone_location(self):
         """Simulate drone movement and update location display"""
         if self.is_running:
-            # Simulate small movements (realistic drone patrol)
-            import random
-            self.drone_lat += (random.random() - 0.5) * 0.0001  # Small lat change
-            self.drone_lon += (random.random() - 0.5) * 0.0001  # Small lon change
-
-            # Keep within reasonable bounds (Jammu border area)
-            self.drone_lat = max(32.7, min(32.85, self.drone_lat))
-            self.drone_lon = max(74.8, min(74.95, self.drone_lon))
+            # Simulate small movements (realistic drone patrol), kept within
+            # reasonable bounds (Jammu border area)
+            self.drone_lat = max(32.7, min(32.85, self.drone_lat + (random.random() - 0.5) * 0.0001))
+            self.drone_lon = max(74.8, min(74.95, self.drone_lon + (random.random() - 0.5) * 0.0001))
 
             # Update sector based on location
             if self.drone_lat > 32.8:
@@ -734,7 +912,11 @@ class DivyaDrishtiGUI:
 
     def start_detection(self):
         """Start drone surveillance"""
-        if not self.detector.is_model_loaded():
+        if not self._warmup_done.is_set():
+            messagebox.showinfo("Please Wait", "The detector is still loading.")
+            return
+
+        if self.detector is None or not self.detector.is_model_loaded():
             messagebox.showerror("Error", "AI detection model not loaded!")
             return
 
@@ -744,7 +926,7 @@ class DivyaDrishtiGUI:
 
         try:
             # Initialize video capture
-            self.cap = cv2.VideoCapture(self.video_source)
+            self.cap = video_optimizer.open_capture(self.video_source)
             if not self.cap.isOpened():
                 messagebox.showerror("Error", f"Could not open video source: {self.video_source}")
                 return
@@ -753,19 +935,35 @@ class DivyaDrishtiGUI:
             video_optimizer.optimize_capture(self.cap)
             capture_info = video_optimizer.get_capture_info(self.cap)
             print(f"📹 Video capture info: {capture_info}")
+            self._source_fps = capture_info.get("fps") or config.MAX_FPS
 
             # Start detection
             self.is_running = True
             self.frame_count = 0
-            self.fps_start_time = time.time()
+            self.fps_counter = 0
+            self.fps_start_time = time.monotonic()
 
             # Update UI
             self.start_button.config(state=tk.DISABLED)
             self.stop_button.config(state=tk.NORMAL)
             self.update_status("🚀 Surveillance started")
 
-            # Start detection thread
-            self.detection_thread = threading.Thread(target=self.detection_loop, daemon=True)
+            # Start capture and detection threads on a fresh queue so a
+            # previous session's threads can never feed (or end) this one
+            self._frame_q = queue.Queue(maxsize=1)
+            self._clear_queue(self._display_q)
+            self._clear_queue(self._out_q)
+            self._dropped_frames = 0
+            self._overlay_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="overlay")
+            if self.auto_save_enabled:
+                self._recorder.start(self._source_fps)
+            # Files are played frame by frame; live sources keep only the newest frame
+            is_file = isinstance(self.video_source, str) and os.path.isfile(self.video_source)
+            self.capture_thread = threading.Thread(target=self.capture_loop,
+                                                   args=(self.cap, self._frame_q, is_file), daemon=True)
+            self.capture_thread.start()
+            self.detection_thread = threading.Thread(target=self.detection_loop,
+                                                     args=(self._frame_q, self._overlay_exec), daemon=True)
             self.detection_thread.start()
 
         except Exception as e:
@@ -776,9 +974,15 @@ class DivyaDrishtiGUI:
         """Stop detection"""
         self.is_running = False
 
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        # The capture thread owns the device and releases it once its
+        # blocking read returns
+        self.cap = None
+
+        # Let in-flight overlays finish on their own, then close the
+        # recording (flushes frames already queued)
+        if self._overlay_exec is not None:
+            self._overlay_exec.shutdown(wait=False)
+        self._recorder.stop()
 
         # Update UI
         self.start_button.config(state=tk.NORMAL)
@@ -788,92 +992,373 @@ class DivyaDrishtiGUI:
         # Clear video displays
         self.clear_video_displays()
 
-    def detection_loop(self):
-        """Optimized main detection loop"""
-        while self.is_running and self.cap and self.cap.isOpened():
+    @staticmethod
+    def _put_latest(q, item, on_drop=None):
+        """Put item on a bounded queue, dropping the oldest entry when full"""
+        while True:
             try:
-                # Capture frame with timing
-                cap_start = performance_profiler.start_timing("frame_capture")
-                ret, frame = self.cap.read()
-                performance_profiler.end_timing("frame_capture", cap_start)
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = q.get_nowait()
+                except queue.Empty:
+                    continue
+                if on_drop is not None and dropped is not None:
+                    on_drop(dropped)
+
+    @staticmethod
+    def _clear_queue(q):
+        """Discard everything currently queued"""
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                return
+
+    def _drop_frame(self, frame):
+        """Account for a captured frame discarded before inference"""
+        self._dropped_frames += 1
+        self._pool.release(frame)
+
+    def _put_blocking(self, q, item):
+        """Put item on a session queue, waiting for room; False once the session ends"""
+        while self.is_running and q is self._frame_q:
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def capture_loop(self, cap, frame_q, is_file=False):
+        """
+        Read and decode frames off the Tk/detection threads (cv2 releases the
+        GIL while blocking). Live sources drop the oldest queued frame so
+        detection always sees the newest one; file sources block until the
+        detection loop takes each frame, so every frame is detected at the
+        loop's MAX_FPS pace instead of the file racing by at decode speed.
+        """
+        frame_shape = None
+        reads = 0
+        read = cap.read
+        try:
+            while self.is_running and frame_q is self._frame_q and cap.isOpened():
+                # Decode into a recycled buffer once the stream's frame size is known
+                buf = self._pool.acquire(frame_shape) if frame_shape is not None else None
+                if reads & _PROFILE_SAMPLE_MASK == 0:
+                    cap_start = time.perf_counter_ns()
+                    ret, frame = read(buf)
+                    performance_profiler.end_timing(_CAPTURE_KEY, cap_start)
+                else:
+                    ret, frame = read(buf)
+                reads += 1
 
                 if not ret:
+                    self._pool.release(buf)
                     break
 
-                # Process frame with optimized YOLO detection
-                start_time = time.time()
-                processed_frame, detections = self.detector.detect(
-                    frame,
-                    confidence_threshold=self.confidence_threshold
-                )
-                inference_time = time.time() - start_time
+                frame_shape = frame.shape
+                if is_file:
+                    if not self._put_blocking(frame_q, frame):
+                        self._pool.release(frame)
+                        break
+                else:
+                    self._put_latest(frame_q, frame, on_drop=self._drop_frame)
 
-                # Update performance monitors
-                self.performance_monitor.update_fps(inference_time)
-                frame_processor.update_fps(1.0 / inference_time if inference_time > 0 else 0)
+        except Exception as e:
+            _log.error("Capture loop error: %s", e)
+
+        finally:
+            cap.release()
+            # End-of-stream sentinel for the detection loop (behind a file's
+            # last frame rather than replacing it)
+            if not (is_file and self._put_blocking(frame_q, None)):
+                self._put_latest(frame_q, None, on_drop=self._pool.release)
+
+    def _collect_batch(self, frame_q, first_frame):
+        """
+        Gather up to INFER_BATCH frames, flushing after INFER_MAX_LATENCY_MS.
+        Returns (frames, end_of_stream).
+        """
+        frames = [first_frame]
+        deadline = time.monotonic() + config.INFER_MAX_LATENCY_MS / 1000.0
+
+        while len(frames) < config.INFER_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                frame = frame_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if frame is None:
+                return frames, True
+            frames.append(frame)
+
+        return frames, False
+
+    def _release_tick(self, tick):
+        """Return a tick's capture and annotated frames to the buffer pool"""
+        frames, results = tick
+        for frame, (processed_frame, _) in zip(frames, results):
+            if processed_frame is not frame:
+                self._pool.release(processed_frame)
+            self._pool.release(frame)
+
+    def _submit_overlay(self, executor, pending, frames, overlays):
+        """
+        Draw and record a tick on the overlay worker so it overlaps the next
+        inference (cv2 drawing releases the GIL). At most one tick waits
+        behind the one being drawn, and a single worker keeps ticks in order.
+        Returns the new pending future.
+        """
+        if pending is not None and not pending.done():
+            wait([pending])
+        try:
+            future = executor.submit(self._render_overlays, frames, overlays)
+        except RuntimeError:
+            # Session stopped (executor shut down) - nothing left to show
+            for frame in frames:
+                self._pool.release(frame)
+            return None
+        future.add_done_callback(self._on_overlay_done)
+        return future
+
+    def _render_overlays(self, frames, overlays):
+        """Overlay worker: annotate each frame and feed the recorder"""
+        results = []
+        # Only a tick's last frame is shown next to its original, so the
+        # others are drawn in place instead of onto a copy
+        last = len(frames) - 1
+        for i, (frame, detections) in enumerate(zip(frames, overlays)):
+            processed_frame = self.detector.annotate(frame, detections, in_place=i < last)
+            # Auto-record (no-op unless recording is armed)
+            self._recorder.write(processed_frame)
+            results.append((processed_frame, detections))
+        return frames, results
+
+    def _on_overlay_done(self, future):
+        """Publish a drawn tick to the display"""
+        try:
+            frames, results = future.result()
+        except Exception as e:
+            _log.error("Overlay error: %s", e)
+            return
+        self._publish_tick(frames, results)
 
-                # Log detections
-                for detection in detections:
-                    self.logger.log_detection(detection, self.frame_count)
+    def _publish_tick(self, frames, results):
+        """Hand a finished tick to the display stage, which converts and recycles it"""
+        self._put_latest(self._display_q, (frames, results), on_drop=self._release_tick)
 
-                # Auto-save screenshots if enabled
-                if self.auto_save_enabled and detections:
-                    utils.save_screenshot(processed_frame, "auto_detection")
+    def detection_loop(self, frame_q, overlay_exec):
+        """Optimized main detection loop"""
+        overlay_future = None  # Last tick handed to this session's overlay stage
+        end_of_stream = False
+        skip_remaining = 0  # Frames left to show with the last overlay (adaptive skip)
+        last_detections = []
+        next_deadline = time.monotonic()  # Pacing target (see end of loop)
+
+        # Bound methods are fixed for the session, so look them up once. Config
+        # flags and the confidence threshold stay live (panel and slider edit
+        # them while running) and are read once per batch instead.
+        detect = self.detector.detect
+        detect_batch = self.detector.detect_batch
+        log_detection = self.logger.log_detection
+        monitor_fps = self.performance_monitor.update_fps
+        processor_fps = frame_processor.update_fps
+        submit_overlay = self._submit_overlay
+        while self.is_running and frame_q is self._frame_q and not end_of_stream:
+            try:
+                try:
+                    frame = frame_q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
 
-                # Update displays
-                self.update_video_displays(frame, processed_frame)
+                if frame is None:
+                    break
 
-                # Update counters
-                self.frame_count += 1
+                if skip_remaining > 0 and config.ADAPTIVE_SKIP_FRAMES:
+                    # Heavy model: show this frame with the last overlay instead
+                    # of waiting on inference (detections were already logged)
+                    skip_remaining -= 1
+                    overlay_future = submit_overlay(overlay_exec, overlay_future,
+                                                    [frame], [last_detections])
+                    self.frame_count += 1
+                    continue
+
+                frames, end_of_stream = self._collect_batch(frame_q, frame)
+
+                # Process frames with optimized YOLO detection (one model call per
+                # batch); boxes are drawn on the overlay stage, not here
+                confidence = self.confidence_threshold
+                dropped_before = self._dropped_frames
+                start_ns = time.monotonic_ns()
+                if len(frames) == 1:
+                    results = [detect(frame, confidence_threshold=confidence, annotate=False)]
+                else:
+                    results = detect_batch(frames, confidence_threshold=confidence, annotate=False)
+                batch_time = (time.monotonic_ns() - start_ns) * 1e-9
+                inference_time = batch_time / len(frames)
 
-                # Adaptive frame rate control
-                target_fps = config.MAX_FPS
+                # Skip inference for the frames that arrived while one ran and
+                # are still waiting; the drop-oldest capture queue has already
+                # discarded the rest, and the newest one is inferred next
                 if config.ADAPTIVE_SKIP_FRAMES:
-                    current_fps = frame_processor._get_current_fps()
-                    if current_fps > 0:
-                        sleep_time = max(0, (1.0 / target_fps) - inference_time)
-                        time.sleep(sleep_time)
+                    last_detections = results[-1][1]
+                    arrived = int(batch_time * self._source_fps)
+                    dropped = self._dropped_frames - dropped_before
+                    skip_remaining = config.INFER_SKIP_FRAMES or max(0, arrived - dropped - 1)
+
+                instant_fps = 1.0 / inference_time if inference_time > 0 else 0
+                for _, detections in results:
+                    # Update performance monitors
+                    monitor_fps(inference_time)
+                    processor_fps(instant_fps)
+
+                    # Log detections
+                    for detection in detections:
+                        log_detection(detection, self.frame_count)
+
+                    # Update counters
+                    self.frame_count += 1
+
+                overlay_future = submit_overlay(overlay_exec, overlay_future, frames,
+                                                [detections for _, detections in results])
+
+                # Frame rate control: sleep to a monotonic deadline so the
+                # loop holds MAX_FPS without drift; when inference is the
+                # bottleneck there is no sleep and the capture queue paces us
+                next_deadline += len(frames) / config.MAX_FPS
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
                 else:
-                    time.sleep(1.0 / target_fps)
+                    next_deadline = time.monotonic()  # Behind: don't try to catch up
 
             except Exception as e:
-                print(f"Detection loop error: {e}")
+                _log.error("Detection loop error: %s", e)
                 break
 
-        # Cleanup
-        if self.cap:
-            self.cap.release()
-        self.is_running = False
+        # Cleanup (a superseded session must not stop the new one)
+        if frame_q is self._frame_q:
+            self.is_running = False
 
-    def update_video_displays(self, original_frame, processed_frame):
-        """Update video display panels"""
-        try:
-            # Resize frames for display (proper size for drone feeds)
-            original_display = utils.resize_frame_for_display(original_frame, 580, 400)
-            processed_display = utils.resize_frame_for_display(processed_frame, 580, 400)
+    def _display_loop(self):
+        """
+        Display stage: fit and color-convert ticks to RGB off both the Tk and
+        detection threads, leaving only the PhotoImage load to Tk. None stops it.
+        """
+        buffers = {}  # Owned by this thread (see _convert_for_display)
+        while True:
+            tick = self._display_q.get()
+            if tick is None:
+                return
 
-            # Convert to PIL Images
-            if original_display is not None:
-                original_rgb = cv2.cvtColor(original_display, cv2.COLOR_BGR2RGB)
-                original_pil = Image.fromarray(original_rgb)
-                original_photo = ImageTk.PhotoImage(original_pil)
+            frames, results = tick
+            try:
+                if not self.is_running:
+                    continue
+                views = [self._convert_for_display(self.original_label, frames[-1], buffers),
+                         self._convert_for_display(self.processed_label, results[-1][0], buffers)]
+            except Exception as e:
+                _log.error("Display conversion error: %s", e)
+                continue
+            finally:
+                # Conversion copied what it needs, so the tick can be recycled
+                self._release_tick(tick)
+
+            self._put_latest(self._out_q, views)
+            try:
+                self.root.event_generate('<<FrameReady>>', when='tail')
+            except tk.TclError:
+                return  # Window is gone
+
+    def _convert_for_display(self, label, frame, buffers):
+        """
+        Fit a BGR frame to its panel and encode it as a binary PPM blob.
+        buffers holds one persistent (size, blob, rgb, bgr) entry per label:
+        resize and color conversion write straight into them, with the RGB
+        array being a view just past the PPM header, so a frame costs one
+        bytes() copy and no allocations until the panel size changes.
+        """
+        height, width = frame.shape[:2]
+        max_w, max_h = self._panel_sizes.get(
+            label, (config.VIDEO_DISPLAY_WIDTH, config.VIDEO_DISPLAY_HEIGHT))
+        size = utils.get_display_size(width, height, max_w, max_h)
+
+        entry = buffers.get(label)
+        if entry is None or entry[0] != size:
+            header = b"P6\n%d %d\n255\n" % size
+            blob = bytearray(len(header) + size[0] * size[1] * 3)
+            blob[:len(header)] = header
+            rgb = np.frombuffer(blob, np.uint8, offset=len(header)).reshape(size[1], size[0], 3)
+            entry = buffers[label] = (size, blob, rgb, np.empty_like(rgb))
+        _, blob, rgb, bgr = entry
+
+        display = utils.resize_frame_for_display(frame, max_w, max_h, dst=bgr)
+        cv2.cvtColor(display, cv2.COLOR_BGR2RGB, dst=rgb)
+        return label, bytes(blob)
+
+    def _on_frame_ready(self, event=None):
+        """
+        Drain converted frames from the display stage and show only the
+        newest pair; older ones were already logged and are just dropped.
+        """
+        latest = None
+        while True:
+            try:
+                latest = self._out_q.get_nowait()
+            except queue.Empty:
+                break
 
-                self.original_label.configure(image=original_photo)
-                self.original_label.image = original_photo
+        if latest is None or not self.is_running:
+            return
 
-            if processed_display is not None:
-                processed_rgb = cv2.cvtColor(processed_display, cv2.COLOR_BGR2RGB)
-                processed_pil = Image.fromarray(processed_rgb)
-                processed_photo = ImageTk.PhotoImage(processed_pil)
+        try:
+            for label, ppm in latest:
+                self._show_ppm(label, ppm)
+        except Exception as e:
+            _log.error("Display update error: %s", e)
 
-                self.processed_label.configure(image=processed_photo)
-                self.processed_label.image = processed_photo
+    def update_video_displays(self, original_frame, processed_frame):
+        """Update video display panels (synchronously, on the Tk thread)"""
+        try:
+            for label, frame in ((self.original_label, original_frame),
+                                 (self.processed_label, processed_frame)):
+                if frame is not None:
+                    self._show_ppm(*self._convert_for_display(label, frame, {}))
 
         except Exception as e:
-            print(f"Display update error: {e}")
+            _log.error("Display update error: %s", e)
+
+    def _on_panel_configure(self, event):
+        """Track the drawable area of a video label so frames are fitted to it"""
+        label = event.widget
+        border = int(label.cget('bd')) + int(label.cget('highlightthickness'))
+        size = (event.width - 2 * border, event.height - 2 * border)
+        if size[0] > 1 and size[1] > 1:
+            # The next frame is fitted to the new size
+            self._panel_sizes[label] = size
+
+    def _show_ppm(self, label, ppm):
+        """
+        Load a PPM blob into the label's persistent PhotoImage. Tk decodes
+        PPM natively, so there is no PIL round-trip, and the image resizes
+        itself to the data when the panel size changes.
+        """
+        photo = self._display_surfaces.get(label)
+        if photo is None:
+            photo = tk.PhotoImage(master=self.root, data=ppm, format='PPM')
+            self._display_surfaces[label] = photo
+            label.configure(image=photo)
+            label.image = photo
+        else:
+            photo.configure(data=ppm, format='PPM')
 
     def clear_video_displays(self):
         """Clear video display panels"""
+        self._display_surfaces.clear()
         self.original_label.configure(image="")
         self.original_label.image = None
         self.processed_label.configure(image="")
@@ -882,52 +1367,112 @@ class DivyaDrishtiGUI:
     def update_status(self, message):
         """Update status message"""
         self.status_label.config(text=message)
-        print(f"Status: {message}")
+        _log.info("Status: %s", message)
+
+    def _every(self, interval_ms, callback):
+        """
+        Run callback on a root.after chain against monotonic deadlines, so
+        callback time doesn't accumulate as drift. A late tick reschedules
+        from now rather than firing a burst to catch up.
+        """
+        interval = interval_ms / 1000.0
+        next_due = time.monotonic()
+
+        def tick():
+            nonlocal next_due
+            try:
+                callback()
+            except Exception as e:
+                _log.error("GUI update error: %s", e)
 
-    def update_gui(self):
-        """Update GUI elements periodically"""
-        try:
-            # Update FPS display
-            current_fps = self.performance_monitor.get_current_fps()
-            self.fps_label.config(text=f"📊 FPS: {current_fps:.1f}")
+            now = time.monotonic()
+            next_due += interval
+            if next_due <= now:
+                next_due = now + interval
+            self.root.after(max(1, int((next_due - now) * 1000)), tick)
 
-            # Update frame count
-            self.frame_label.config(text=f"🎬 FRAMES: {self.frame_count:,}")
+        tick()
 
-            # Update drone location
-            self.update_drone_location()
+    def _window_visible(self):
+        """False while the main window is minimized or withdrawn"""
+        return bool(self.root.winfo_viewable())
 
-            # Update detection log
-            self.update_detection_log()
+    def _tick_fast(self):
+        """FPS/frame counters"""
+        if self._window_visible():
+            self._update_stats_bar()
 
-            # Update performance display
+    def _tick_slow(self):
+        """Performance panel refresh"""
+        if self._window_visible():
             self.update_performance_display()
 
-        except Exception as e:
-            print(f"GUI update error: {e}")
+    def _flush_logs(self):
+        """Periodic detection log refresh; detections are only buffered in the logger"""
+        if self._window_visible():
+            self.update_detection_log()
 
-        # Schedule next update
-        self.root.after(1000, self.update_gui)  # Update every second
+    def _update_stats_bar(self):
+        """
+        Measure FPS over the window since the last refresh and touch the
+        status labels only when their text changes
+        """
+        now = time.monotonic()
+        frame_count = self.frame_count
+        dt = now - self.fps_start_time
+        if dt > 0:
+            self.current_fps = (frame_count - self.fps_counter) / dt
+        self.fps_counter = frame_count
+        self.fps_start_time = now
+
+        fps_text = f"📊 FPS: {self.current_fps:.1f}"
+        frames_text = f"🎬 FRAMES: {frame_count:,}"
+        shown_fps, shown_frames = self._stats_bar_text
+        if fps_text != shown_fps:
+            self.fps_label.config(text=fps_text)
+        if frames_text != shown_frames:
+            self.frame_label.config(text=frames_text)
+        self._stats_bar_text = (fps_text, frames_text)
 
     def update_detection_log(self):
-        """Update detection log display"""
+        """
+        Update detection log display. New notifications are appended and the
+        oldest lines trimmed, so a refresh costs O(new lines); the full redraw
+        only happens for the first detections and after the log is cleared.
+        """
         try:
-            summary = self.logger.get_detection_summary()
+            count = self.logger.session_stats['total_detections']
+            shown = self._shown_log_count
+            if count == shown:
+                return
+            self._shown_log_count = count
 
-            # Clear and update log text
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(tk.END, summary)
+            if not shown or count < shown:
+                # Clear and update log text
+                self.log_text.delete(1.0, tk.END)
+                self.log_text.insert(tk.END, self.logger.get_detection_summary())
+            else:
+                lines = self.logger.get_new_notifications(shown)
+                self.log_text.insert(tk.END, "\n" + "\n".join(lines))
+                line_count = int(self.log_text.index('end-1c').split('.')[0])
+                excess = line_count - self.logger.SUMMARY_LINES
+                if excess > 0:
+                    self.log_text.delete(1.0, f"{excess + 1}.0")
 
             # Auto-scroll to bottom
             self.log_text.see(tk.END)
 
         except Exception as e:
-            print(f"Log update error: {e}")
+            _log.error("Log update error: %s", e)
 
     def update_performance_display(self):
         """Update performance display"""
         try:
             perf_summary = self.performance_monitor.get_performance_summary()
+            perf_summary += f"\n🗑️ Dropped Frames: {self._dropped_frames:,}"
+            if perf_summary == self._shown_perf:
+                return
+            self._shown_perf = perf_summary
 
             # Clear and update performance text
             self.perf_text.delete(1.0, tk.END)
@@ -937,7 +1482,7 @@ class DivyaDrishtiGUI:
             self.perf_text.see(tk.END)
 
         except Exception as e:
-            print(f"Performance update error: {e}")
+            _log.error("Performance update error: %s", e)
 
     def on_closing(self):
         """Handle application closing"""
@@ -947,6 +1492,13 @@ class DivyaDrishtiGUI:
         # Stop performance monitoring
         self.performance_monitor.stop_monitoring()
 
+        # Stop the model worker after any queued job, and the display stage
+        self._model_cmd_q.put(None)
+        self._put_latest(self._display_q, None, on_drop=self._release_tick)
+
+        # Finish any recording in progress
+        self._recorder.stop()
+
         # Export logs
         try:
             self.logger.export_logs()
@@ -956,6 +1508,9 @@ class DivyaDrishtiGUI:
 
         self.root.destroy()
 
+        # Flush queued diagnostics
+        _log_listener.stop()
+
 def main():
     """Main application entry point"""
     root = tk.Tk()
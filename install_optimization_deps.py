@@ -8,11 +8,15 @@ import sys
 import os
 
 
+# Wheels only where available - avoids e.g. compiling onnxsim's C++ from source
+PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--prefer-binary"]
+
+
 def install_package(package):
     """Install a package using pip"""
     try:
         print(f"📦 Installing {package}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        subprocess.check_call([*PIP_INSTALL, package])
         print(f"✅ {package} installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -20,6 +24,23 @@ def install_package(package):
         return False
 
 
+def install_packages(packages):
+    """
+    Install packages in one pip run (a single dependency resolution); if that
+    fails, retry one by one so a bad package doesn't block the rest
+    """
+    if not packages:
+        return True
+    try:
+        print(f"📦 Installing {', '.join(packages)}...")
+        subprocess.check_call([*PIP_INSTALL, *packages])
+        print("✅ Packages installed successfully")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"⚠️ Batch install failed ({e}) - retrying packages individually")
+        return all([install_package(package) for package in packages])
+
+
 def check_gpu_support():
     """Check if NVIDIA GPU is available"""
     try:
@@ -59,28 +80,25 @@ def install_optimization_dependencies():
     
     # Install core packages
     print("\n📦 Installing core optimization packages...")
-    for package in core_packages:
-        install_package(package)
+    install_packages(core_packages)
     
     # Install GPU packages if GPU is available
     if gpu_available:
         print("\n🎮 Installing GPU optimization packages...")
-        for package in gpu_packages:
-            if "tensorrt" in package:
-                print(f"⚠️ TensorRT requires manual installation from NVIDIA")
-                print("   Visit: https://developer.nvidia.com/tensorrt")
-                continue
-            install_package(package)
+        if any("tensorrt" in package for package in gpu_packages):
+            print(f"⚠️ TensorRT requires manual installation from NVIDIA")
+            print("   Visit: https://developer.nvidia.com/tensorrt")
+        install_packages([package for package in gpu_packages if "tensorrt" not in package])
     
     # Additional performance packages
     performance_packages = [
         "psutil>=5.9.0",  # For system monitoring
         "numpy>=1.21.0",  # Ensure latest numpy
+        "numba>=0.57.0",  # JIT for frame similarity (optional)
     ]
     
     print("\n⚡ Installing performance monitoring packages...")
-    for package in performance_packages:
-        install_package(package)
+    install_packages(performance_packages)
     
     print("\n✅ Optimization dependencies installation complete!")
     print("\n📋 Summary:")
@@ -3,7 +3,9 @@ DivyaDrishti Model Optimizer
 Handles TensorRT, ONNX, and other model optimizations for faster inference
 """
 
+import hashlib
 import os
+import threading
 import time
 import torch
 import cv2
@@ -17,35 +19,39 @@ class ModelOptimizer:
     def __init__(self):
         self.optimized_models = {}
         self.optimization_cache = {}
+        self._loaded_yolos = {}  # model_path -> YOLO kept untouched for re-exports
+        # The GUI model worker (load/switch) and the panel's "optimize all"
+        # job both export; one at a time so they never build the same artifact
+        self._lock = threading.RLock()
         self.device = self._get_device()
         
     def _get_device(self):
-        """Get the best available device"""
-        if config.DEVICE == "auto":
-            if torch.cuda.is_available() and config.ENABLE_GPU:
-                return "cuda"
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                return "mps"
-            else:
-                return "cpu"
-        return config.DEVICE
+        """Get the best available device (resolved once in config)"""
+        return config.get_device()
     
     def optimize_model(self, model_path, model_key):
         """
         Optimize a YOLO model for faster inference
         Returns optimized model path or original if optimization fails
         """
+        with self._lock:
+            return self._optimize_model(model_path, model_key)
+    
+    def _optimize_model(self, model_path, model_key):
+        """optimize_model body; caller holds self._lock"""
         try:
             print(f"🚀 Optimizing model: {model_key}")
             
             # Check if already optimized
-            cache_key = f"{model_key}_{self.device}_{config.MODEL_PRECISION}"
+            cache_key = self._cache_key(model_path, model_key)
             if cache_key in self.optimization_cache:
                 print(f"✅ Using cached optimized model for {model_key}")
                 return self.optimization_cache[cache_key]
             
-            # Load original model
-            model = YOLO(model_path)
+            # Load original model (parsed once per path; export doesn't change weights)
+            model = self._loaded_yolos.get(model_path)
+            if model is None:
+                model = self._loaded_yolos[model_path] = YOLO(model_path)
             
             # Try TensorRT optimization for NVIDIA GPUs
             if self.device == "cuda" and config.ENABLE_TENSORRT:
@@ -61,28 +67,93 @@ class ModelOptimizer:
                     self.optimization_cache[cache_key] = optimized_path
                     return optimized_path
             
-            # Apply in-memory optimizations
-            optimized_model = self._apply_memory_optimizations(model)
-            if optimized_model:
-                return model_path  # Return original path with optimized model in memory
-                
+            # No export available: the detector loads the original weights and
+            # applies device placement, FP16, channels-last and torch.compile
+            # to its own model (ObjectDetector._prepare_model)
+            print(f"ℹ️ No exported backend for {model_key} - in-memory optimizations apply at load")
             return model_path
             
         except Exception as e:
             print(f"⚠️ Model optimization failed for {model_key}: {e}")
             return model_path
     
+    def _cache_key(self, model_path, model_key):
+        """
+        Key for optimization_cache: the weights plus every setting that picks
+        the backend or changes the exported artifact
+        """
+        return (model_key, str(model_path), self.device, config.MODEL_PRECISION,
+                config.ENABLE_HALF_PRECISION, config.ENABLE_TENSORRT, config.ENABLE_ONNX,
+                config.TENSORRT_IMGSZ, config.INFER_BATCH,
+                str(config.TENSORRT_CALIB_DATA), config.TENSORRT_CALIB_FRACTION)
+    
+    def optimize_all_models(self):
+        """Optimize every configured model; returns {model_key: model path to load}"""
+        return {key: self.optimize_model(spec.path, key)
+                for key, spec in config.AVAILABLE_MODELS.items()}
+    
+    def _tensorrt_precision(self):
+        """
+        Resolve config.MODEL_PRECISION to what the TensorRT export can build.
+        INT8 needs a calibration dataset. FP8 needs an Ada/Hopper GPU
+        (compute capability 8.9+); the Ultralytics exporter has no FP8 switch,
+        so on those GPUs it builds the INT8 engine, the nearest 8-bit mode.
+        """
+        precision = config.MODEL_PRECISION
+        if precision == "fp8":
+            if torch.cuda.get_device_capability() >= (8, 9):
+                print("ℹ️ FP8 is not exposed by the TensorRT exporter - building INT8")
+                precision = "int8"
+            else:
+                print("⚠️ FP8 needs compute capability 8.9+ - using FP16")
+                precision = "fp16"
+        
+        if precision == "int8" and not Path(config.TENSORRT_CALIB_DATA).exists():
+            print(f"⚠️ INT8 calibration data not found ({config.TENSORRT_CALIB_DATA}) - using FP16")
+            precision = "fp16"
+        
+        return precision
+    
     def _optimize_tensorrt(self, model, model_key):
-        """Optimize model using TensorRT"""
+        """Optimize model using TensorRT (FP16, or INT8 with calibration)"""
         try:
             print(f"🔧 Applying TensorRT optimization to {model_key}...")
+            precision = self._tensorrt_precision()
             
             # Create optimized model directory
             opt_dir = Path("Models/optimized/tensorrt")
             opt_dir.mkdir(parents=True, exist_ok=True)
             
-            # TensorRT export path
-            tensorrt_path = opt_dir / f"{model_key}_tensorrt.engine"
+            # Export arguments. Static batch-1 engine unless live frames are
+            # micro-batched, in which case partial batches need a dynamic
+            # batch dimension
+            imgsz = config.TENSORRT_IMGSZ
+            batch = max(1, config.INFER_BATCH)
+            export_args = {
+                "imgsz": imgsz,
+                "batch": batch,
+                "dynamic": batch > 1,
+                "workspace": 4,  # 4GB workspace
+            }
+            if precision == "int8":
+                # Calibrate on frames from the actual drone feed to limit accuracy loss
+                calib_data = Path(config.TENSORRT_CALIB_DATA).resolve()
+                export_args.update(int8=True, data=str(calib_data),
+                                   fraction=config.TENSORRT_CALIB_FRACTION)
+            else:
+                export_args["half"] = config.ENABLE_HALF_PRECISION and precision != "fp32"
+            
+            # TensorRT engine path. The name carries every export argument the
+            # engine depends on (input size, batch, dynamic shape, workspace,
+            # precision actually built and, for INT8, the calibration set and
+            # fraction), so changing any of them builds a new one
+            if precision == "int8":
+                calib_id = hashlib.sha1(export_args["data"].encode()).hexdigest()[:8]
+                label = f"int8-{calib_id}-f{export_args['fraction']:g}"
+            else:
+                label = "fp16" if export_args["half"] else "fp32"
+            shape = f"b{batch}{'-dyn' if export_args['dynamic'] else ''}"
+            tensorrt_path = opt_dir / f"{model_key}_{imgsz}_{shape}_ws{export_args['workspace']}_{label}.engine"
             
             # Skip if already exists and is recent
             if tensorrt_path.exists():
@@ -93,13 +164,15 @@ class ModelOptimizer:
             success = model.export(
                 format="engine",
                 device=self.device,
-                half=config.ENABLE_HALF_PRECISION,
-                dynamic=False,
                 simplify=True,
-                workspace=4,  # 4GB workspace
-                verbose=False
+                verbose=False,
+                **export_args
             )
             
+            # The exporter writes next to the weights; keep it where the cache check looks
+            if success and Path(success).exists() and Path(success).resolve() != tensorrt_path.resolve():
+                Path(success).replace(tensorrt_path)
+            
             if success and tensorrt_path.exists():
                 print(f"✅ TensorRT optimization successful: {tensorrt_path}")
                 return str(tensorrt_path)
@@ -118,86 +191,112 @@ class ModelOptimizer:
             opt_dir = Path("Models/optimized/onnx")
             opt_dir.mkdir(parents=True, exist_ok=True)
             
-            # ONNX export path
-            onnx_path = opt_dir / f"{model_key}_optimized.onnx"
+            # ONNX export path, the INT8 copy for CPU deployments, and the
+            # graph-optimized file baked from whichever is used. Names carry
+            # everything the result depends on: input size, device (the baked
+            # graph is fused for its providers) and precision, so changing any
+            # of them exports anew instead of reusing a stale file
+            imgsz = config.TENSORRT_IMGSZ
+            half = config.ENABLE_HALF_PRECISION and self.device == "cuda"  # Exporter only does FP16 on GPU
+            stem = f"{model_key}_{imgsz}_{self.device}"
+            onnx_path = opt_dir / f"{stem}_{'fp16' if half else 'fp32'}.onnx"
+            quantize = self.device == "cpu" and config.MODEL_PRECISION == "int8"
+            final_path = opt_dir / f"{stem}_int8.onnx" if quantize else onnx_path
+            opt_path = final_path.with_suffix(".opt.onnx")
             
             # Skip if already exists
-            if onnx_path.exists():
-                print(f"✅ ONNX model already exists: {onnx_path}")
-                return str(onnx_path)
-            
-            # Export to ONNX
-            success = model.export(
-                format="onnx",
-                device=self.device,
-                half=config.ENABLE_HALF_PRECISION,
-                dynamic=False,
-                simplify=True,
-                opset=12,
-                verbose=False
-            )
+            for path in (opt_path, final_path):
+                if path.exists():
+                    print(f"✅ ONNX model already exists: {path}")
+                    return str(path)
+            
+            if not onnx_path.exists():
+                # Export to ONNX (opset 17 lets ORT substitute its newer fused ops)
+                success = model.export(
+                    format="onnx",
+                    device=self.device,
+                    imgsz=imgsz,
+                    half=half,
+                    dynamic=False,
+                    simplify=True,
+                    opset=17,
+                    verbose=False
+                )
+                
+                # The exporter writes next to the weights; keep it with the other artifacts
+                if success and Path(success).exists() and Path(success).resolve() != onnx_path.resolve():
+                    Path(success).replace(onnx_path)
             
-            if success and onnx_path.exists():
+            if onnx_path.exists():
                 print(f"✅ ONNX optimization successful: {onnx_path}")
-                return str(onnx_path)
+                if quantize and not self._quantize_onnx(onnx_path, final_path):
+                    final_path, opt_path = onnx_path, onnx_path.with_suffix(".opt.onnx")
+                return self._bake_onnx_optimizations(final_path, opt_path)
                 
         except Exception as e:
             print(f"⚠️ ONNX optimization failed: {e}")
         
         return None
     
-    def _apply_memory_optimizations(self, model):
-        """Apply in-memory optimizations"""
+    def _quantize_onnx(self, onnx_path, int8_path):
+        """Dynamic INT8 weight quantization for CPU inference; False if unavailable"""
         try:
-            print("🔧 Applying memory optimizations...")
-            
-            # Move to device and optimize
-            if self.device != "cpu":
-                model.to(self.device)
-            
-            # Enable half precision if supported
-            if config.ENABLE_HALF_PRECISION and self.device == "cuda":
-                model.half()
-            
-            # Set to evaluation mode
-            model.eval()
-            
-            # Warm up the model
-            self._warm_up_model(model)
-            
-            print("✅ Memory optimizations applied")
-            return model
-            
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            print("⚠️ onnxruntime quantization not available - using FP32 ONNX")
+            return False
+        
+        try:
+            quantize_dynamic(str(onnx_path), str(int8_path), weight_type=QuantType.QInt8)
+            print(f"✅ INT8 ONNX model saved: {int8_path}")
+            return True
         except Exception as e:
-            print(f"⚠️ Memory optimization failed: {e}")
-            return None
+            print(f"⚠️ ONNX INT8 quantization failed: {e}")
+            return False
     
-    def _warm_up_model(self, model):
-        """Warm up model with dummy inputs"""
+    def _bake_onnx_optimizations(self, onnx_path, opt_path):
+        """
+        Simplify the exported graph (onnxsim) and save onnxruntime's
+        ORT_ENABLE_ALL fusions into opt_path, so they are not redone at every
+        session start. The baked file targets this device's providers.
+        Returns the best path available.
+        """
         try:
-            print("🔥 Warming up model...")
-            
-            # Create dummy input
-            dummy_input = torch.randn(1, 3, 640, 640)
-            if self.device != "cpu":
-                dummy_input = dummy_input.to(self.device)
-            
-            if config.ENABLE_HALF_PRECISION and self.device == "cuda":
-                dummy_input = dummy_input.half()
-            
-            # Warm up iterations
-            with torch.no_grad():
-                for i in range(config.WARM_UP_ITERATIONS):
-                    _ = model(dummy_input, verbose=False)
-            
-            print(f"✅ Model warmed up with {config.WARM_UP_ITERATIONS} iterations")
-            
+            import onnx
+            import onnxsim
+            simplified, ok = onnxsim.simplify(onnx.load(str(onnx_path)))
+            if ok:
+                onnx.save(simplified, str(onnx_path))
+        except ImportError:
+            pass  # Ultralytics already ran its own simplify pass
         except Exception as e:
-            print(f"⚠️ Model warm-up failed: {e}")
+            print(f"⚠️ onnxsim pass failed: {e}")
+        
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return str(onnx_path)
+        
+        try:
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.optimized_model_filepath = str(opt_path)
+            providers = ["CPUExecutionProvider"]
+            if self.device == "cuda":
+                providers.insert(0, "CUDAExecutionProvider")
+            ort.InferenceSession(str(onnx_path), options, providers=providers)
+            if opt_path.exists():
+                print(f"✅ ONNX graph optimizations saved: {opt_path}")
+                return str(opt_path)
+        except Exception as e:
+            print(f"⚠️ ONNX Runtime optimization failed: {e}")
+        
+        return str(onnx_path)
     
     def get_optimization_info(self, model_key):
         """Get optimization information for a model"""
-        cache_key = f"{model_key}_{self.device}_{config.MODEL_PRECISION}"
+        spec = config.AVAILABLE_MODELS.get(model_key)
+        cache_key = self._cache_key(spec.path if spec else None, model_key)
         
         info = {
             "model_key": model_key,
@@ -214,32 +313,53 @@ class ModelOptimizer:
     
     def clear_optimization_cache(self):
         """Clear optimization cache"""
-        self.optimization_cache.clear()
+        with self._lock:
+            self.optimization_cache.clear()
+            self._loaded_yolos.clear()
         print("🗑️ Optimization cache cleared")
     
-    def benchmark_model(self, model_path, iterations=100):
-        """Benchmark model performance"""
+    def benchmark_model(self, model, iterations=100, *, input_shape=(640, 640)):
+        """
+        Benchmark raw network performance. model is a loaded YOLO (a path is
+        still accepted and loaded once). The input tensor lives on the device
+        and feeds model.model directly, so neither Ultralytics preprocessing
+        nor a per-iteration host-to-device copy is timed.
+        """
         try:
-            print(f"📊 Benchmarking model: {model_path}")
-            
-            model = YOLO(model_path)
-            if self.device != "cpu":
-                model.to(self.device)
-            
-            # Create test input
-            test_input = np.random.randint(0, 255, (640, 480, 3), dtype=np.uint8)
-            
-            # Warm up
-            for _ in range(10):
-                _ = model(test_input, verbose=False)
-            
-            # Benchmark
-            times = []
-            for i in range(iterations):
-                start_time = time.time()
-                _ = model(test_input, verbose=False)
-                end_time = time.time()
-                times.append(end_time - start_time)
+            if isinstance(model, (str, Path)):
+                model = YOLO(model)
+                if self.device != "cpu":
+                    model.to(self.device)
+            print(f"📊 Benchmarking model: {getattr(model, 'ckpt_path', None) or type(model).__name__}")
+            
+            net = model.model
+            param = next(net.parameters())
+            
+            # Create test input (on the network's device, in its dtype)
+            test_input = torch.randint(0, 255, (1, 3, *input_shape), device=param.device,
+                                       dtype=torch.uint8).to(param.dtype) / 255.0
+            use_cuda_events = param.device.type == "cuda"
+            
+            with torch.inference_mode():
+                # Warm up
+                for _ in range(10):
+                    _ = net(test_input)
+                
+                # Benchmark (CUDA events time the GPU work, not Python overhead)
+                times = []
+                for i in range(iterations):
+                    if use_cuda_events:
+                        start_event = torch.cuda.Event(enable_timing=True)
+                        end_event = torch.cuda.Event(enable_timing=True)
+                        start_event.record()
+                        _ = net(test_input)
+                        end_event.record()
+                        end_event.synchronize()
+                        times.append(start_event.elapsed_time(end_event) / 1000.0)
+                    else:
+                        start_ns = time.perf_counter_ns()
+                        _ = net(test_input)
+                        times.append((time.perf_counter_ns() - start_ns) / 1e9)
             
             avg_time = sum(times) / len(times)
             fps = 1.0 / avg_time
@@ -3,46 +3,79 @@ DivyaDrishti Multi-Model Object Detector
 Support for multiple YOLO models with dynamic switching
 """
 
+import functools
+import gc
+import logging
+import os
 import cv2
 import torch
+from collections import OrderedDict
 import numpy as np
 from ultralytics import YOLO
 from pathlib import Path
 import config
 import utils
 from model_optimizer import model_optimizer
-from frame_processor import frame_processor, performance_profiler
+from frame_processor import frame_processor, performance_profiler, buffer_pool
+
+# Child of the GUI's "divyadrishti" logger, so it shares its level and queue handler
+_log = logging.getLogger("divyadrishti.detector")
+
+
+@functools.lru_cache(maxsize=1)
+def _setup_torch(device):
+    """One-shot process-wide torch configuration (repeat calls are free)"""
+    torch.set_num_threads(config.TORCH_THREADS)
+    if device == "cuda":
+        # Input shape is fixed per stream, so cuDNN autotunes each conv
+        # once; TF32 lets FP32 layers use Tensor Cores on Ampere+
+        torch.backends.cudnn.benchmark = True
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.set_float32_matmul_precision('high')
+
+
+# Box colors cycled by track ID for tracked people
+_TRACK_COLORS = ((0, 255, 0), (255, 0, 255), (255, 255, 0), (0, 255, 255), (255, 128, 0))
+
+# Box color per class name, filled on first sight (class lists change with the model)
+_CLASS_COLORS = {}
 
 class MultiModelDetector:
+    STATS_WINDOW = 100  # Frames averaged by get_performance_stats
+
     def __init__(self):
         self.model = None
         self.device = self._get_device()
         self.current_mode = config.DETECTION_MODE
         self.is_loaded = False
         self.class_names = []
+        self._gpu_preprocess = False  # Feed GPU-preprocessed tensors (see _supports_tensor_input)
+        self._stride = 32
+
+        _setup_torch(self.device)
+        # frame_processor snapshotted config before "auto" was resolved
+        frame_processor.reload_config()
 
         # Multi-model support
         self.current_model_key = config.DEFAULT_MODEL_KEY
         self.available_models = config.AVAILABLE_MODELS
-        self.loaded_models = {}  # Cache for loaded models
+        # LRU of switched-out, initialized models: key -> (model, class_names,
+        # gpu_preprocess, stride); most recently used last
+        self.loaded_models = OrderedDict()
 
         # Performance tracking
-        self.inference_times = []
+        # Per-frame inference times in a fixed ring (no unbounded list growth)
+        self._inference_ring = np.zeros(self.STATS_WINDOW, dtype=np.float32)
+        self._inference_count = 0  # Total samples written
         self.frame_count = 0
 
         # Load the default model
         self.load_model(self.current_model_key)
 
     def _get_device(self):
-        """Determine the best device for inference"""
-        if config.DEVICE == "auto":
-            if torch.cuda.is_available() and config.ENABLE_GPU:
-                return "cuda"
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                return "mps"
-            else:
-                return "cpu"
-        return config.DEVICE
+        """Determine the best device for inference (resolved once in config)"""
+        return config.get_device()
 
     def load_model(self, model_key=None):
         """Load a YOLO model by key (initial load only)"""
@@ -59,34 +92,84 @@ class MultiModelDetector:
     def switch_model(self, model_key):
         """Switch to a different model"""
         if model_key == self.current_model_key:
-            print(f"✓ Already using {self.available_models[model_key]['name']}")
+            print(f"✓ Already using {self.available_models[model_key].name}")
             return True
 
-        print(f"🔄 Switching from {self.get_current_model_name()} to {self.available_models[model_key]['name']}...")
+        print(f"🔄 Switching from {self.get_current_model_name()} to {self.available_models[model_key].name}...")
 
-        # Clear current model completely
+        # Keep the current model warm for switching back
+        if self.is_model_loaded():
+            self.loaded_models[self.current_model_key] = (
+                self.model, self.class_names, self._gpu_preprocess, self._stride)
         self.model = None
         self.is_loaded = False
         self.class_names = []
 
-        # Clear GPU cache if using CUDA
-        if self.device != "cpu":
-            import torch
-            torch.cuda.empty_cache()
+        cached = self.loaded_models.pop(model_key, None)
+        if cached is not None:
+            self.model, self.class_names, self._gpu_preprocess, self._stride = cached
+            self._reset_trackers(self.model)
+            self.current_model_key = model_key
+            self.is_loaded = True
+            self._evict_cached_models()
+            print(f"✓ Switched to cached {self.available_models[model_key].name}")
+            return True
 
-        # Load the new model fresh (no caching for model switching)
+        # Make room before loading the new model fresh
+        self._evict_cached_models(reserve=1)
         success = self._load_model_fresh(model_key)
 
         if success:
-            print(f"✓ Successfully switched to {self.available_models[model_key]['name']}")
-            print(f"✓ Model type: {self.available_models[model_key]['type']}")
+            print(f"✓ Successfully switched to {self.available_models[model_key].name}")
+            print(f"✓ Model type: {self.available_models[model_key].type}")
             print(f"✓ Classes loaded: {len(self.class_names)}")
             print(f"✓ First 5 classes: {self.class_names[:5] if len(self.class_names) > 5 else self.class_names}")
         else:
-            print(f"✗ Failed to switch to {self.available_models[model_key]['name']}")
+            print(f"✗ Failed to switch to {self.available_models[model_key].name}")
 
         return success
 
+    def _evict_cached_models(self, reserve=0):
+        """
+        Trim the switched-out model LRU to config.MAX_CACHED_MODELS (minus
+        reserve slots for a model about to load), and drop all of it when
+        the GPU is short on free memory. Evicted models leave the GPU before
+        its cache is released, and the cache is only released (a device-wide
+        sync) when memory is short - otherwise the next load reuses it.
+        """
+        limit = max(0, config.MAX_CACHED_MODELS - reserve)
+        low_memory = False
+        if self.device == "cuda" and self.loaded_models:
+            free, total = torch.cuda.mem_get_info()
+            low_memory = free < total * config.MODEL_CACHE_MIN_FREE_GPU
+            if low_memory:
+                limit = 0
+
+        evicted = False
+        while len(self.loaded_models) > limit:
+            key, (model, _, _, _) = self.loaded_models.popitem(last=False)
+            try:
+                model.to('cpu')
+            except Exception:
+                pass  # Exported engines can't move; dropping the reference frees them
+            del model
+            evicted = True
+            print(f"🗑️ Evicted cached model: {key}")
+
+        if evicted:
+            gc.collect()  # Wrapper/predictor reference cycles keep weights alive otherwise
+            if low_memory:
+                torch.cuda.empty_cache()
+
+    @staticmethod
+    def _reset_trackers(model):
+        """Start tracking afresh on a model resumed from the cache (its old tracks are stale)"""
+        for tracker in getattr(getattr(model, 'predictor', None), 'trackers', None) or ():
+            try:
+                tracker.reset()
+            except Exception:
+                pass
+
     def _load_model_fresh(self, model_key):
         """Load a model fresh without using cache"""
         if model_key not in self.available_models:
@@ -94,16 +177,16 @@ class MultiModelDetector:
             return False
 
         model_info = self.available_models[model_key]
-        model_path = model_info["path"]
+        model_path = model_info.path
 
         try:
-            print(f"🔄 Loading {model_info['name']} fresh from: {model_path}")
+            print(f"🔄 Loading {model_info.name} fresh from: {model_path}")
 
             # Validate model file before loading
-            if not self._validate_model_file(model_path, model_info['name']):
-                print(f"🔄 Attempting to re-download {model_info['name']}...")
-                if not self._redownload_model(model_path, model_info['name']):
-                    print(f"✗ Failed to re-download {model_info['name']}")
+            if not self._validate_model_file(model_path, model_info.name):
+                print(f"🔄 Attempting to re-download {model_info.name}...")
+                if not self._redownload_model(model_path, model_info.name):
+                    print(f"✗ Failed to re-download {model_info.name}")
                     return False
 
             # Optimize model if enabled
@@ -115,26 +198,16 @@ class MultiModelDetector:
 
             # Load new model (force fresh load - don't use any cache)
             self.model = YOLO(model_path)
+            self._prepare_model()
 
-            # Move model to device and apply optimizations
-            if self.device != "cpu":
-                self.model.to(self.device)
-
-            # Apply half precision if enabled
-            if config.ENABLE_HALF_PRECISION and self.device == "cuda":
-                try:
-                    self.model.half()
-                    print("✅ Half precision (FP16) enabled")
-                except Exception as e:
-                    print(f"⚠️ Half precision failed: {e}")
+            self._gpu_preprocess = self._supports_tensor_input()
 
             # Update current model key FIRST
             self.current_model_key = model_key
 
-            # Force model to initialize by running a dummy prediction
-            import numpy as np
-            dummy_img = np.zeros((640, 640, 3), dtype=np.uint8)
-            _ = self.model(dummy_img, verbose=False)
+            # Force model to initialize and warm up on dummy frames
+            frame_processor.warm_up(self.model)
+            self._optimize_predictor_model()
 
             # Get class names from the model after initialization
             if hasattr(self.model, 'names') and self.model.names:
@@ -143,25 +216,22 @@ class MultiModelDetector:
                 print(f"✓ Model classes: {self.class_names}")
             else:
                 # Fallback to predefined classes
-                self.class_names = model_info["classes"]
+                self.class_names = list(model_info.classes)
                 print(f"✓ Using predefined {len(self.class_names)} classes")
                 print(f"✓ Predefined classes: {self.class_names}")
 
-            # DON'T cache the model - always load fresh for switching
-            # self.loaded_models[model_key] = self.model
-
             self.is_loaded = True
-            print(f"✓ {model_info['name']} loaded successfully on {self.device.upper()}")
+            print(f"✓ {model_info.name} loaded successfully on {self.device.upper()}")
 
             return True
 
         except Exception as e:
-            print(f"✗ Error loading {model_info['name']}: {e}")
+            print(f"✗ Error loading {model_info.name}: {e}")
 
             # If it's a corrupted file error, try to fix it
             if "PytorchStreamReader failed" in str(e) or "failed finding central directory" in str(e):
                 print(f"🔧 Detected corrupted model file. Attempting to fix...")
-                if self._fix_corrupted_model(model_path, model_info['name']):
+                if self._fix_corrupted_model(model_path, model_info.name):
                     print(f"🔄 Retrying model load after fixing corruption...")
                     # Retry once with a flag to prevent infinite recursion
                     return self._load_model_retry(model_key)
@@ -171,10 +241,65 @@ class MultiModelDetector:
             self.is_loaded = False
             return False
 
+    def _prepare_model(self):
+        """
+        Device placement and FP16 for PyTorch weights. Exported backends
+        (TensorRT engine, ONNX) reject .to()/.half(); they take device and half
+        from the predict/track arguments instead. Layout and compilation wait
+        for the predictor (see _optimize_predictor_model).
+        """
+        if not isinstance(getattr(self.model, 'model', None), torch.nn.Module):
+            print("ℹ️ Exported model - device and precision are set per inference call")
+            return
+
+        # Move model to device
+        if self.device != "cpu":
+            self.model.to(self.device)
+
+        # Apply half precision if enabled
+        if config.ENABLE_HALF_PRECISION and self.device == "cuda":
+            try:
+                self.model.half()
+                print("✅ Half precision (FP16) enabled")
+            except Exception as e:
+                print(f"⚠️ Half precision failed: {e}")
+
+    def _optimize_predictor_model(self):
+        """
+        Channels-last and torch.compile on the module the predictor actually
+        runs. The first prediction builds AutoBackend, which fuses Conv+BN into
+        new (contiguous) convolutions and, for a compiled wrapper, returns the
+        plain module from fuse(); both therefore have to happen after that
+        setup, on predictor.model.model. With reduce-overhead the warm-up pass
+        that follows captures the CUDA graphs.
+        """
+        if self.device != "cuda":
+            return
+        backend = getattr(getattr(self.model, 'predictor', None), 'model', None)
+        net = getattr(backend, 'model', None)
+        if not isinstance(net, torch.nn.Module) or hasattr(net, '_orig_mod'):
+            return  # Exported backend, or already compiled (cached model)
+
+        # Channels-last (NHWC) weights; convolutions then produce NHWC
+        # activations for tensor cores instead of relayouting each input
+        try:
+            net = net.to(memory_format=torch.channels_last)
+            backend.model = net
+        except Exception as e:
+            print(f"⚠️ Channels-last layout failed: {e}")
+
+        if config.ENABLE_TORCH_COMPILE and hasattr(torch, "compile"):
+            try:
+                backend.model = torch.compile(net, mode="reduce-overhead", fullgraph=False)
+                # Compilation is lazy: this warm-up compiles and captures graphs
+                frame_processor.warm_up(self.model)
+                print("🔧 torch.compile enabled (reduce-overhead)")
+            except Exception as e:
+                backend.model = net
+                print(f"⚠️ torch.compile unavailable: {e}")
+
     def _validate_model_file(self, model_path, model_name):
         """Validate if model file exists and is not corrupted"""
-        import os
-
         # For custom models (absolute paths), check if file exists
         if os.path.isabs(model_path):
             if not os.path.exists(model_path):
@@ -199,7 +324,6 @@ class MultiModelDetector:
 
             # Try to read the file as a zip to check if it's corrupted
             try:
-                import torch
                 # Just try to load the file structure without loading the model
                 with open(model_path, 'rb') as f:
                     # Read first few bytes to check if it's a valid zip/torch file
@@ -220,8 +344,6 @@ class MultiModelDetector:
 
     def _redownload_model(self, model_path, model_name):
         """Re-download a corrupted model file"""
-        import os
-
         # Only handle YOLO models (not custom models)
         if os.path.isabs(model_path):
             print(f"✗ Cannot re-download custom model: {model_path}")
@@ -252,25 +374,23 @@ class MultiModelDetector:
             return False
 
         model_info = self.available_models[model_key]
-        model_path = model_info["path"]
+        model_path = model_info.path
 
         try:
-            print(f"🔄 Retry loading {model_info['name']} from: {model_path}")
+            print(f"🔄 Retry loading {model_info.name} from: {model_path}")
 
             # Load new model (force fresh load - don't use any cache)
             self.model = YOLO(model_path)
+            self._prepare_model()
 
-            # Move model to device
-            if self.device != "cpu":
-                self.model.to(self.device)
+            self._gpu_preprocess = self._supports_tensor_input()
 
             # Update current model key FIRST
             self.current_model_key = model_key
 
-            # Force model to initialize by running a dummy prediction
-            import numpy as np
-            dummy_img = np.zeros((640, 640, 3), dtype=np.uint8)
-            _ = self.model(dummy_img, verbose=False)
+            # Force model to initialize and warm up on dummy frames
+            frame_processor.warm_up(self.model)
+            self._optimize_predictor_model()
 
             # Get class names from the model after initialization
             if hasattr(self.model, 'names') and self.model.names:
@@ -279,17 +399,17 @@ class MultiModelDetector:
                 print(f"✓ Model classes: {self.class_names}")
             else:
                 # Fallback to predefined classes
-                self.class_names = model_info["classes"]
+                self.class_names = list(model_info.classes)
                 print(f"✓ Using predefined {len(self.class_names)} classes")
                 print(f"✓ Predefined classes: {self.class_names}")
 
             self.is_loaded = True
-            print(f"✓ {model_info['name']} loaded successfully on retry!")
+            print(f"✓ {model_info.name} loaded successfully on retry!")
 
             return True
 
         except Exception as e:
-            print(f"✗ Retry failed for {model_info['name']}: {e}")
+            print(f"✗ Retry failed for {model_info.name}: {e}")
             self.is_loaded = False
             return False
 
@@ -302,7 +422,7 @@ class MultiModelDetector:
     def get_current_model_name(self):
         """Get the name of the current model"""
         info = self.get_current_model_info()
-        return info["name"] if info else "Unknown"
+        return info.name if info else "Unknown"
 
     def get_available_models(self):
         """Get list of available models"""
@@ -312,15 +432,27 @@ class MultiModelDetector:
         """Get formatted model list for GUI dropdown"""
         models = []
         for key, info in self.available_models.items():
-            display_name = f"{info['icon']} {info['name']} - {info['description']}"
+            display_name = f"{info.icon} {info.name} - {info.description}"
             models.append((key, display_name))
         return models
 
-    def detect(self, frame, confidence_threshold=None, enable_tracking=None):
+    def detect(self, frame, confidence_threshold=None, enable_tracking=None, annotate=True):
         """Detect objects in frame using YOLO tracking for persistent annotations"""
         if not self.is_model_loaded():
             return frame, []
 
+        return self.detect_batch([frame], confidence_threshold, enable_tracking, annotate)[0]
+
+    def detect_batch(self, frames, confidence_threshold=None, enable_tracking=None, annotate=True):
+        """
+        Detect objects in a list of frames with a single model call.
+        Returns a list of (annotated_frame, detections), one per input frame.
+        With annotate=False the input frame is returned as-is so drawing can
+        happen elsewhere (see annotate()).
+        """
+        if not self.is_model_loaded():
+            return [(frame, []) for frame in frames]
+
         if confidence_threshold is None:
             confidence_threshold = config.CONFIDENCE_THRESHOLD
 
@@ -335,206 +467,254 @@ class MultiModelDetector:
             # DISABLE frame skipping for tracking - we need every frame for continuity
             # Only optimize the frame, don't skip it
             opt_start = performance_profiler.start_timing("frame_optimization")
-            optimized_frame = frame_processor.optimize_frame(frame)
+            optimized_frames = [frame_processor.optimize_frame(frame) for frame in frames]
             performance_profiler.end_timing("frame_optimization", opt_start)
 
             # Model inference with tracking for persistent IDs
             inf_start = performance_profiler.start_timing("model_inference")
-
-            if enable_tracking:
-                # Use YOLO tracking mode with persistent IDs
-                try:
-                    results = self.model.track(
-                        optimized_frame,
-                        conf=confidence_threshold,
-                        iou=config.IOU_THRESHOLD,
-                        max_det=config.MAX_DETECTIONS,
-                        persist=True,  # This is KEY for persistent tracking
-                        device=self.device,
-                        verbose=False,
-                        half=config.ENABLE_HALF_PRECISION and self.device == "cuda"
-                    )
-                except Exception as track_error:
-                    print(f"⚠️ Tracking failed, falling back to detection: {track_error}")
-                    # Fallback to regular detection if tracking fails
-                    results = self.model(
-                        optimized_frame,
-                        conf=confidence_threshold,
-                        iou=config.IOU_THRESHOLD,
-                        max_det=config.MAX_DETECTIONS,
-                        device=self.device,
-                        verbose=False,
-                        half=config.ENABLE_HALF_PRECISION and self.device == "cuda"
-                    )
-            else:
-                # Fallback to regular detection
-                results = self.model(
-                    optimized_frame,
-                    conf=confidence_threshold,
-                    iou=config.IOU_THRESHOLD,
-                    max_det=config.MAX_DETECTIONS,
-                    device=self.device,
-                    verbose=False,
-                    half=config.ENABLE_HALF_PRECISION and self.device == "cuda"
-                )
-
+            # No autograd bookkeeping for the upload and the whole predictor
+            # pass (preprocess, forward, NMS, tracker update). FP16 comes from
+            # the half weights and the predictor's half=True, not autocast
+            with torch.inference_mode():
+                if self._gpu_preprocess and all(f.shape == optimized_frames[0].shape for f in optimized_frames):
+                    source = frame_processor.to_model_tensor(optimized_frames, self._stride)
+                else:
+                    source = optimized_frames[0] if len(optimized_frames) == 1 else optimized_frames
+                results = self._run_inference(source, confidence_threshold, enable_tracking)
             inference_time = performance_profiler.end_timing("model_inference", inf_start)
 
             # Process results
             post_start = performance_profiler.start_timing("post_processing")
-            detections = []
-            annotated_frame = frame.copy()
-
-            # Debug: Print detection info
-            if results and len(results) > 0:
-                result = results[0]
-                print(f"🔍 Detection result: boxes={result.boxes is not None}, "
-                      f"num_boxes={len(result.boxes) if result.boxes is not None else 0}")
-
-                if result.boxes is not None and len(result.boxes) > 0:
-                    boxes = result.boxes.xyxy.cpu().numpy()
-                    confidences = result.boxes.conf.cpu().numpy()
-                    class_ids = result.boxes.cls.cpu().numpy().astype(int)
-
-                    # Get tracking IDs if available (from tracking mode)
-                    track_ids = None
-                    if hasattr(result.boxes, 'id') and result.boxes.id is not None:
-                        track_ids = result.boxes.id.cpu().numpy().astype(int)
-
-                    for i, (box, conf, cls_id) in enumerate(zip(boxes, confidences, class_ids)):
-                        x1, y1, x2, y2 = box
-
-                        # Scale coordinates back to original frame size if frame was resized
-                        if config.FRAME_RESIZE_ENABLED:
-                            orig_h, orig_w = frame.shape[:2]
-                            opt_h, opt_w = optimized_frame.shape[:2]
-
-                            if orig_w != opt_w or orig_h != opt_h:
-                                scale_x = orig_w / opt_w
-                                scale_y = orig_h / opt_h
-                                x1, x2 = x1 * scale_x, x2 * scale_x
-                                y1, y2 = y1 * scale_y, y2 * scale_y
-
-                        # Get class name
-                        class_name = self.class_names[cls_id] if cls_id < len(self.class_names) else f"class_{cls_id}"
-
-                        # Get tracking ID if available
-                        track_id = track_ids[i] if track_ids is not None and i < len(track_ids) else None
-
-                        # Create detection info with tracking ID
-                        detection = {
-                            'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                            'confidence': float(conf),
-                            'class_id': int(cls_id),
-                            'class_name': class_name,
-                            'track_id': track_id,  # Add tracking ID
-                            'area': utils.calculate_box_area(x1, y1, x2, y2),
-                            'center': utils.calculate_box_center(x1, y1, x2, y2)
-                        }
-
-                        detections.append(detection)
-
-                        # Draw bounding box and label with tracking ID
-                        annotated_frame = self._draw_detection(annotated_frame, detection)
-
+            outputs = [
+                self._process_result(frame, optimized_frame, result, annotate)
+                for frame, optimized_frame, result in zip(frames, optimized_frames, results)
+            ]
+            # Frames the model returned no result for have nothing to draw
+            outputs.extend((frame, []) for frame in frames[len(outputs):])
             performance_profiler.end_timing("post_processing", post_start)
             performance_profiler.end_timing("total_pipeline", total_start)
 
-            # Update performance tracking
-            self.inference_times.append(inference_time)
-            self.frame_count += 1
+            # Update performance tracking (inference time amortized per frame)
+            per_frame_time = inference_time / len(frames)
+            count = self._inference_count
+            for i in range(count, count + len(frames)):
+                self._inference_ring[i % self.STATS_WINDOW] = per_frame_time
+            self._inference_count = count + len(frames)
+            self.frame_count += len(frames)
 
-            return annotated_frame, detections
+            return outputs
 
         except Exception as e:
-            print(f"✗ Detection error: {e}")
-            return frame, []
-
-
-
-    def _draw_detection(self, frame, detection):
-        """Draw detection on frame with cyberpunk styling and tracking ID"""
-        x1, y1, x2, y2 = detection['bbox']
-        confidence = detection['confidence']
-        class_name = detection['class_name']
-        track_id = detection.get('track_id', None)
+            _log.error("✗ Detection error: %s", e)
+            return [(frame, []) for frame in frames]
+
+    def _supports_tensor_input(self):
+        """
+        GPU preprocessing applies to PyTorch models on CUDA; exported engines
+        are built for a fixed input shape and keep the Ultralytics path. It
+        moves letterbox/normalize off the CPU but still costs one small
+        host-to-device and one device-to-host copy per frame (Ultralytics
+        converts tensor input back to a numpy orig_img for Results)
+        """
+        net = getattr(self.model, 'model', None)
+        if not (config.GPU_PREPROCESS and self.device == "cuda" and isinstance(net, torch.nn.Module)):
+            return False
+        self._stride = int(net.stride.max()) if hasattr(net, 'stride') else 32
+        return True
 
-        # Dynamic color scheme based on class with tracking-specific colors
-        if class_name == "person":
-            if track_id is not None:
-                # Use consistent colors for tracked people based on ID
-                color_map = [(0, 255, 0), (255, 0, 255), (255, 255, 0), (0, 255, 255), (255, 128, 0)]
-                color = color_map[track_id % len(color_map)]
-            else:
-                color = (0, 255, 0)  # Default green for untracked people
-        elif "trail" in class_name.lower() or "path" in class_name.lower():
-            color = (0, 255, 255)  # Cyan for trails
+    def _run_inference(self, source, confidence_threshold, enable_tracking):
+        """Run the model (tracking or plain detection) on a frame or list of frames"""
+        if enable_tracking:
+            # Use YOLO tracking mode with persistent IDs
+            try:
+                return self.model.track(
+                    source,
+                    conf=confidence_threshold,
+                    iou=config.IOU_THRESHOLD,
+                    max_det=config.MAX_DETECTIONS,
+                    persist=True,  # This is KEY for persistent tracking
+                    device=self.device,
+                    verbose=False,
+                    half=config.ENABLE_HALF_PRECISION and self.device == "cuda"
+                )
+            except Exception as track_error:
+                _log.warning("⚠️ Tracking failed, falling back to detection: %s", track_error)
+
+        # Regular detection (or fallback if tracking fails)
+        return self.model(
+            source,
+            conf=confidence_threshold,
+            iou=config.IOU_THRESHOLD,
+            max_det=config.MAX_DETECTIONS,
+            device=self.device,
+            verbose=False,
+            half=config.ENABLE_HALF_PRECISION and self.device == "cuda"
+        )
+
+    def _process_result(self, frame, optimized_frame, result, annotate=True):
+        """Convert one YOLO result into detection dicts and an annotated frame"""
+        detections = []
+
+        # Debug: per-result detection info (formatted only when DEBUG is on)
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("🔍 Detection result: boxes=%s, num_boxes=%d", result.boxes is not None,
+                       len(result.boxes) if result.boxes is not None else 0)
+
+        if result.boxes is not None and len(result.boxes) > 0:
+            # One device-to-host copy of the packed (N, 6|7) tensor instead of
+            # one per field: x1, y1, x2, y2, [track id], conf, cls
+            data = result.boxes.data.cpu().numpy()
+            boxes = data[:, :4]
+            confidences = data[:, -2]
+            class_ids = data[:, -1].astype(int)
+
+            # Get tracking IDs if available (from tracking mode)
+            track_ids = data[:, 4].astype(int).tolist() if data.shape[1] == 7 else None
+
+            # Scale coordinates back to original frame size if frame was resized
+            # (whole array at once, float64 like the per-box math it replaces)
+            boxes = boxes.astype(np.float64)
+            if config.FRAME_RESIZE_ENABLED:
+                orig_h, orig_w = frame.shape[:2]
+                opt_h, opt_w = optimized_frame.shape[:2]
+
+                if orig_w != opt_w or orig_h != opt_h:
+                    boxes[:, 0::2] *= orig_w / opt_w
+                    boxes[:, 1::2] *= orig_h / opt_h
+
+            # Geometry for every box in a few array ops; Python only builds the dicts
+            x1, y1, x2, y2 = boxes.T
+            areas = (np.abs(x2 - x1) * np.abs(y2 - y1)).tolist()
+            centers = zip(((x1 + x2) / 2).tolist(), ((y1 + y2) / 2).tolist())
+            bboxes = boxes.astype(int).tolist()
+
+            names = self.class_names
+            for i, (bbox, conf, cls_id, area, center) in enumerate(
+                    zip(bboxes, confidences.tolist(), class_ids.tolist(), areas, centers)):
+                # Create detection info with tracking ID
+                detections.append({
+                    'bbox': bbox,
+                    'confidence': conf,
+                    'class_id': cls_id,
+                    'class_name': names[cls_id] if cls_id < len(names) else f"class_{cls_id}",
+                    'track_id': track_ids[i] if track_ids is not None else None,
+                    'area': area,
+                    'center': center
+                })
+
+        # Draw bounding boxes and labels with tracking IDs
+        annotated_frame = self.annotate(frame, detections) if annotate else frame
+        return annotated_frame, detections
+
+
+
+    def annotate(self, frame, detections, in_place=False):
+        """
+        Draw existing detections (no inference). Draws onto a pooled copy of
+        frame, or onto frame itself with in_place=True when the caller does not
+        need the original. With nothing to draw, frame is returned uncopied.
+        """
+        if in_place or not detections:
+            annotated_frame = frame
         else:
-            color = (128, 128, 128)  # Grey for other detections
-
-        # Draw bounding box with cyberpunk style
+            annotated_frame = buffer_pool.acquire(frame.shape, frame.dtype)
+            np.copyto(annotated_frame, frame)
+        if detections:
+            self._draw_all(annotated_frame, detections)
+        return annotated_frame
+
+    @staticmethod
+    def _detection_color(class_name, track_id):
+        """Dynamic color scheme based on class with tracking-specific colors"""
+        if track_id is not None and class_name == "person":
+            # Use consistent colors for tracked people based on ID
+            return _TRACK_COLORS[track_id % len(_TRACK_COLORS)]
+        color = _CLASS_COLORS.get(class_name)
+        if color is None:
+            lowered = class_name.lower()
+            if class_name == "person":
+                color = (0, 255, 0)  # Default green for untracked people
+            elif "trail" in lowered or "path" in lowered:
+                color = (0, 255, 255)  # Cyan for trails
+            else:
+                color = (128, 128, 128)  # Grey for other detections
+            _CLASS_COLORS[class_name] = color
+        return color
+
+    def _draw_all(self, frame, detections):
+        """
+        Draw all detections on frame with cyberpunk styling and tracking IDs.
+        Boxes and corner accents are batched into one polylines call per
+        color and label borders into one per color; label backgrounds and
+        text are drawn per detection. Labels are drawn after all boxes, so they stay legible
+        where boxes overlap.
+        """
         thickness = 3  # Increased thickness for better visibility
-        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
-
-        # Draw corner accents
         corner_length = 25  # Increased corner length
         corner_thickness = 4  # Increased corner thickness
-
-        # Top-left corner
-        cv2.line(frame, (x1, y1), (x1 + corner_length, y1), color, corner_thickness)
-        cv2.line(frame, (x1, y1), (x1, y1 + corner_length), color, corner_thickness)
-
-        # Top-right corner
-        cv2.line(frame, (x2, y1), (x2 - corner_length, y1), color, corner_thickness)
-        cv2.line(frame, (x2, y1), (x2, y1 + corner_length), color, corner_thickness)
-
-        # Bottom-left corner
-        cv2.line(frame, (x1, y2), (x1 + corner_length, y2), color, corner_thickness)
-        cv2.line(frame, (x1, y2), (x1, y2 - corner_length), color, corner_thickness)
-
-        # Bottom-right corner
-        cv2.line(frame, (x2, y2), (x2 - corner_length, y2), color, corner_thickness)
-        cv2.line(frame, (x2, y2), (x2, y2 - corner_length), color, corner_thickness)
-
-        # Label with tracking ID if available
-        if track_id is not None:
-            label = f"{class_name.upper()} ID:{track_id} {confidence:.1%}"
-        else:
-            label = f"{class_name.upper()} {confidence:.1%}"
-
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 0.7  # Increased font size
         font_thickness = 2
 
-        (label_width, label_height), baseline = cv2.getTextSize(label, font, font_scale, font_thickness)
-
-        # Draw label background
-        cv2.rectangle(frame,
-                     (x1, y1 - label_height - 10),
-                     (x1 + label_width + 10, y1),
-                     (0, 0, 0), -1)
-
-        # Draw label border
-        cv2.rectangle(frame,
-                     (x1, y1 - label_height - 10),
-                     (x1 + label_width + 10, y1),
-                     color, 1)
+        by_color = {}
+        labels = []
+        for detection in detections:
+            class_name = detection['class_name']
+            track_id = detection.get('track_id', None)
+            color = self._detection_color(class_name, track_id)
+            by_color.setdefault(color, []).append(detection['bbox'])
 
-        # Draw label text
-        cv2.putText(frame, label, (x1 + 5, y1 - 5), font, font_scale, color, font_thickness)
-
-        return frame
+            # Label with tracking ID if available
+            if track_id is not None:
+                label = f"{class_name.upper()} ID:{track_id} {detection['confidence']:.1%}"
+            else:
+                label = f"{class_name.upper()} {detection['confidence']:.1%}"
+            labels.append((label, detection['bbox'][0], detection['bbox'][1], color))
+
+        # Boxes and corner accents, per color
+        corner_dx = np.array([corner_length, -corner_length, corner_length, -corner_length], np.int32)
+        corner_dy = np.array([corner_length, corner_length, -corner_length, -corner_length], np.int32)
+        for color, bboxes in by_color.items():
+            x1, y1, x2, y2 = np.asarray(bboxes, dtype=np.int32).T
+            corner_x = np.stack([x1, x2, x1, x2], axis=1)  # TL, TR, BL, BR
+            corner_y = np.stack([y1, y1, y2, y2], axis=1)
+
+            rects = np.stack([corner_x[:, [0, 1, 3, 2]], corner_y[:, [0, 1, 3, 2]]], axis=-1)
+            cv2.polylines(frame, list(rects), True, color, thickness)
+
+            start = np.stack([corner_x, corner_y], axis=-1)
+            horizontal = np.stack([start, np.stack([corner_x + corner_dx, corner_y], axis=-1)], axis=2)
+            vertical = np.stack([start, np.stack([corner_x, corner_y + corner_dy], axis=-1)], axis=2)
+            segments = np.concatenate([horizontal, vertical], axis=1).reshape(-1, 2, 2)
+            cv2.polylines(frame, list(segments), False, color, corner_thickness)
+
+        # Label backgrounds (one filled rectangle each: a single multi-polygon
+        # fillPoly uses even-odd filling and leaves overlaps unfilled), then
+        # borders per color and the text
+        borders = {}
+        for label, x1, y1, color in labels:
+            (label_width, label_height), baseline = cv2.getTextSize(label, font, font_scale, font_thickness)
+            top, right = y1 - label_height - 10, x1 + label_width + 10
+            cv2.rectangle(frame, (x1, top), (right, y1), (0, 0, 0), -1)
+            rect = np.array([[x1, top], [right, top], [right, y1], [x1, y1]], np.int32)
+            borders.setdefault(color, []).append(rect)
+
+        for color, rects in borders.items():
+            cv2.polylines(frame, rects, True, color, 1)
+        for label, x1, y1, color in labels:
+            cv2.putText(frame, label, (x1 + 5, y1 - 5), font, font_scale, color, font_thickness)
 
     def get_performance_stats(self):
         """Get performance statistics"""
-        if len(self.inference_times) == 0:
+        samples = min(self._inference_count, self.STATS_WINDOW)
+        if samples == 0:
             return {
                 'avg_inference_time': 0,
                 'fps': 0,
                 'total_frames': self.frame_count
             }
 
-        avg_time = np.mean(self.inference_times[-100:])  # Last 100 frames
+        avg_time = float(self._inference_ring[:samples].mean())  # Last 100 frames
         fps = 1.0 / avg_time if avg_time > 0 else 0
 
         return {
@@ -545,9 +725,13 @@ class MultiModelDetector:
 
     def reset_stats(self):
         """Reset performance statistics"""
-        self.inference_times.clear()
+        self._inference_count = 0
         self.frame_count = 0
 
+    def reset_tracking(self):
+        """Drop the current model's tracks so IDs start afresh"""
+        self._reset_trackers(self.model)
+
     def switch_mode(self, mode):
         """Switch between detection and segmentation modes"""
         if mode not in ["detect", "segment", "track"]:
@@ -567,6 +751,7 @@ class MultiModelDetector:
             else:
                 config.USE_TRACKING = False
                 print("✓ Detection mode - tracking disabled")
+            frame_processor.reload_config()
 
             return True
         except Exception as e:
@@ -579,6 +764,7 @@ class MultiModelDetector:
         if enable:
             config.SMART_FRAME_SELECTION = False  # Disable frame skipping for tracking
             config.ADAPTIVE_SKIP_FRAMES = False
+            frame_processor.reload_config()
             print("✅ Object tracking enabled - persistent annotations activated")
         else:
             print("⚠️ Object tracking disabled - single-shot detection mode")
@@ -3,20 +3,120 @@ DivyaDrishti Optimization Control Panel
 GUI for controlling performance optimization settings
 """
 
+import json
+import os
+import time
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import config
 from frame_processor import frame_processor, performance_profiler
-from model_optimizer import model_optimizer
+
+# Checkbox settings per tab: (attribute for the BooleanVar, label, config key,
+# whether frame_processor must reload its config)
+BOOL_SETTINGS_MODEL = [
+    ("tensorrt_var", "Enable TensorRT Optimization (NVIDIA GPU)", "ENABLE_TENSORRT", False),
+    ("onnx_var", "Enable ONNX Optimization", "ENABLE_ONNX", False),
+    ("half_precision_var", "Enable Half Precision (FP16)", "ENABLE_HALF_PRECISION", False),
+]
+BOOL_SETTINGS_FRAME = [
+    ("resize_var", "Enable Frame Resizing", "FRAME_RESIZE_ENABLED", True),
+    ("smart_selection_var", "Enable Smart Frame Selection", "SMART_FRAME_SELECTION", True),
+    ("adaptive_skip_var", "Enable Adaptive Frame Skipping", "ADAPTIVE_SKIP_FRAMES", True),
+]
+BOOL_SETTINGS_ADV = [
+    ("batch_var", "Enable Batch Processing (Experimental)", "BATCH_PROCESSING", False),
+]
+
+# Config values the panel edits, saved across sessions (see _save_settings)
+PERSISTED_SETTINGS = frozenset(
+    [spec[2] for spec in BOOL_SETTINGS_MODEL + BOOL_SETTINGS_FRAME + BOOL_SETTINGS_ADV] + [
+        "MODEL_PRECISION", "TENSORRT_CALIB_DATA", "TENSORRT_CALIB_FRACTION",
+        "FRAME_RESIZE_WIDTH", "FRAME_RESIZE_HEIGHT", "INFER_SKIP_FRAMES",
+        "WARM_UP_ITERATIONS", "INFER_BATCH", "INFER_MAX_LATENCY_MS",
+    ])
+
+# Resize dimensions snap to the detector stride so frames need no extra padding
+RESIZE_STRIDE = 32
+
+# Shared widget fonts
+FONT_XS = ("Consolas", 9)
+FONT_SM = ("Consolas", 10)
+FONT_SM_BOLD = ("Consolas", 10, "bold")
+FONT_HEADING = ("Consolas", 12, "bold")
+FONT_TITLE = ("Consolas", 16, "bold")
 
 
 class OptimizationPanel:
+    CONFIG_DEBOUNCE_MS = 150  # Coalesce bursts of control changes (e.g. Spinbox arrow clicks)
+    STATS_REFRESH_MS = 2000
+    _gpu_support = None  # (cuda_available, fast_fp16), probed once per process
+
     def __init__(self, parent):
         self.parent = parent
         self.optimization_window = None
+        self.notebook = None
+        self.perf_frame = None
+        self._last_stats = None  # Last text shown in stats_text
+        self._perf_cache = (None, {}, [])  # (profiler sample_version, report, bottlenecks)
+        self._log_lines = deque(maxlen=200)  # Panel messages shown on the Performance tab
+        self._log_text = None
+        self._log_render_pending = False
+        self._refresh_after_id = None
+        self._refresh_failures = 0  # Consecutive profiler errors (backs off auto-refresh)
+        # Model exports take minutes; one worker keeps them off the Tk thread and serialized
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="optimize")
+        self.optimize_btn = None
+        self._pending_config = {}
+        self._pending_reload = False
+        self._flush_job = None
+        self._probe_overrides = {}  # Saved values a hardware probe switched off this session
+        
+        # Restore last session's choices before any model loads, so exported
+        # engines for that precision/batch are found instead of rebuilt
+        self._load_settings()
+        
+    def _load_settings(self):
+        """Apply saved panel settings to config (unknown keys are ignored)"""
+        try:
+            with open(config.PANEL_SETTINGS_FILE, encoding='utf-8') as file:
+                saved = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read panel settings: {e}")
+            return
+        
+        for name in PERSISTED_SETTINGS.intersection(saved):
+            value = saved[name]
+            setattr(config, name, Path(value) if name == "TENSORRT_CALIB_DATA" else value)
+        frame_processor.reload_config()
+        print(f"✓ Restored optimization settings from {config.PANEL_SETTINGS_FILE}")
+        
+    def _save_settings(self):
+        """Write the persisted settings atomically (temp file, then replace)"""
+        path = config.PANEL_SETTINGS_FILE
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                # Probe overrides are per machine and session; keep the user's choice
+                settings = {name: getattr(config, name) for name in sorted(PERSISTED_SETTINGS)}
+                settings.update(self._probe_overrides)
+                json.dump(settings, file, indent=2, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self._log(f"⚠️ Could not save panel settings: {e}")
         
     def show_optimization_panel(self):
         """Show the optimization control panel"""
+        theme = config.CYBERPUNK_THEME
+        bg = theme["bg_color"]
+        fg = theme["text_color"]
+        primary = theme["primary_color"]
+
         if self.optimization_window and self.optimization_window.winfo_exists():
             self.optimization_window.lift()
             return
@@ -24,244 +124,240 @@ class OptimizationPanel:
         self.optimization_window = tk.Toplevel(self.parent)
         self.optimization_window.title("🚀 Performance Optimization")
         self.optimization_window.geometry("600x700")
-        self.optimization_window.configure(bg=config.CYBERPUNK_THEME["bg_color"])
+        self.optimization_window.configure(bg=bg)
         
         # Make window resizable
         self.optimization_window.resizable(True, True)
+        self.optimization_window.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        # Shared label/checkbox look, applied by Tk per style instead of per widget
+        style = ttk.Style(self.optimization_window)
+        style.configure("Cyber.TLabel", background=bg, foreground=fg, font=FONT_SM)
+        style.configure("Cyber.TCheckbutton", background=bg, foreground=fg, font=FONT_SM,
+                        indicatorbackground=theme["button_color"])
+        style.map("Cyber.TCheckbutton", background=[("active", bg)])
         
         # Create main frame with scrollbar
-        main_frame = tk.Frame(self.optimization_window, bg=config.CYBERPUNK_THEME["bg_color"])
+        main_frame = tk.Frame(self.optimization_window, bg=bg)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Title
         title_label = tk.Label(
             main_frame,
             text="🚀 Performance Optimization Control",
-            font=("Consolas", 16, "bold"),
-            fg=config.CYBERPUNK_THEME["primary_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
+            font=FONT_TITLE,
+            fg=primary,
+            bg=bg
         )
         title_label.pack(pady=(0, 20))
         
         # Create notebook for tabs
         notebook = ttk.Notebook(main_frame)
         notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = notebook
         
         # Model Optimization Tab
-        model_frame = tk.Frame(notebook, bg=config.CYBERPUNK_THEME["bg_color"])
+        model_frame = tk.Frame(notebook, bg=bg)
         notebook.add(model_frame, text="Model Optimization")
         self._create_model_optimization_tab(model_frame)
         
         # Frame Processing Tab
-        frame_frame = tk.Frame(notebook, bg=config.CYBERPUNK_THEME["bg_color"])
+        frame_frame = tk.Frame(notebook, bg=bg)
         notebook.add(frame_frame, text="Frame Processing")
         self._create_frame_processing_tab(frame_frame)
         
         # Performance Monitor Tab
-        perf_frame = tk.Frame(notebook, bg=config.CYBERPUNK_THEME["bg_color"])
+        perf_frame = tk.Frame(notebook, bg=bg)
         notebook.add(perf_frame, text="Performance Monitor")
+        self.perf_frame = perf_frame
         self._create_performance_monitor_tab(perf_frame)
         
+        # Fresh stats as soon as the monitor tab is opened
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        
         # Advanced Settings Tab
-        advanced_frame = tk.Frame(notebook, bg=config.CYBERPUNK_THEME["bg_color"])
+        advanced_frame = tk.Frame(notebook, bg=bg)
         notebook.add(advanced_frame, text="Advanced")
         self._create_advanced_settings_tab(advanced_frame)
         
     def _create_model_optimization_tab(self, parent):
         """Create model optimization controls"""
+        theme = config.CYBERPUNK_THEME
+        bg = theme["bg_color"]
+        primary = theme["primary_color"]
+
         # Model Optimization Section
         opt_frame = tk.LabelFrame(
             parent,
             text="Model Optimization",
-            font=("Consolas", 12, "bold"),
-            fg=config.CYBERPUNK_THEME["primary_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
+            font=FONT_HEADING,
+            fg=primary,
+            bg=bg
         )
         opt_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        # TensorRT Toggle
-        self.tensorrt_var = tk.BooleanVar(value=config.ENABLE_TENSORRT)
-        tensorrt_check = tk.Checkbutton(
-            opt_frame,
-            text="Enable TensorRT Optimization (NVIDIA GPU)",
-            variable=self.tensorrt_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_tensorrt
-        )
-        tensorrt_check.pack(anchor=tk.W, padx=10, pady=5)
-        
-        # ONNX Toggle
-        self.onnx_var = tk.BooleanVar(value=config.ENABLE_ONNX)
-        onnx_check = tk.Checkbutton(
-            opt_frame,
-            text="Enable ONNX Optimization",
-            variable=self.onnx_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_onnx
-        )
-        onnx_check.pack(anchor=tk.W, padx=10, pady=5)
-        
-        # Half Precision Toggle
-        self.half_precision_var = tk.BooleanVar(value=config.ENABLE_HALF_PRECISION)
-        half_check = tk.Checkbutton(
-            opt_frame,
-            text="Enable Half Precision (FP16)",
-            variable=self.half_precision_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_half_precision
-        )
-        half_check.pack(anchor=tk.W, padx=10, pady=5)
+        # Engine toggles, disabled where the hardware can't use them (the
+        # overrides themselves normally ran before the first model load)
+        self.apply_hardware_overrides()
+        checks = {spec[0]: self._make_bool_setting(opt_frame, *spec) for spec in BOOL_SETTINGS_MODEL}
+        cuda_available, fast_fp16 = self._probe_gpu_support()
+        if not cuda_available:
+            checks["tensorrt_var"].config(state=tk.DISABLED, text="Enable TensorRT Optimization — no NVIDIA GPU")
+        if cuda_available and not fast_fp16:
+            checks["half_precision_var"].config(state=tk.DISABLED,
+                                                text="Enable Half Precision (FP16) — not supported on this GPU")
         
         # Model Precision Selection
-        precision_frame = tk.Frame(opt_frame, bg=config.CYBERPUNK_THEME["bg_color"])
+        self._precision_frame = precision_frame = tk.Frame(opt_frame, bg=bg)
         precision_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Label(
-            precision_frame,
-            text="Model Precision:",
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
-        ).pack(side=tk.LEFT)
+        ttk.Label(precision_frame, text="Model Precision:", style="Cyber.TLabel").pack(side=tk.LEFT)
         
         self.precision_var = tk.StringVar(value=config.MODEL_PRECISION)
         precision_combo = ttk.Combobox(
             precision_frame,
             textvariable=self.precision_var,
-            values=["fp32", "fp16", "int8"],
+            values=["fp32", "fp16", "int8", "fp8"],
             state="readonly",
             width=10
         )
         precision_combo.pack(side=tk.LEFT, padx=(10, 0))
         precision_combo.bind("<<ComboboxSelected>>", self._update_precision)
         
+        # INT8 calibration (TensorRT falls back to FP16 without a dataset)
+        self._int8_frame = tk.Frame(opt_frame, bg=bg)
+        
+        ttk.Label(self._int8_frame, text="Calibration data (.yaml):", style="Cyber.TLabel").grid(row=0, column=0, sticky=tk.W)
+        
+        self.calib_data_var = tk.StringVar(value=str(config.TENSORRT_CALIB_DATA))
+        calib_entry = tk.Entry(
+            self._int8_frame,
+            textvariable=self.calib_data_var,
+            width=40
+        )
+        calib_entry.grid(row=0, column=1, padx=(10, 0), sticky=tk.W)
+        calib_entry.bind("<Return>", self._update_calibration)
+        calib_entry.bind("<FocusOut>", self._update_calibration)
+        
+        ttk.Label(self._int8_frame, text="Dataset fraction:", style="Cyber.TLabel").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        
+        self.calib_fraction_var = tk.DoubleVar(value=config.TENSORRT_CALIB_FRACTION)
+        fraction_spin = tk.Spinbox(
+            self._int8_frame,
+            from_=0.1,
+            to=1.0,
+            increment=0.1,
+            textvariable=self.calib_fraction_var,
+            width=10,
+            command=self._update_calibration
+        )
+        fraction_spin.grid(row=1, column=1, padx=(10, 0), pady=(5, 0), sticky=tk.W)
+        self._bind_commit(fraction_spin, self._update_calibration)
+        self._show_int8_settings()
+        
         # Optimize Models Button
-        optimize_btn = tk.Button(
+        self.optimize_btn = optimize_btn = tk.Button(
             opt_frame,
             text="🚀 Optimize All Models",
-            font=("Consolas", 10, "bold"),
-            fg=config.CYBERPUNK_THEME["bg_color"],
-            bg=config.CYBERPUNK_THEME["primary_color"],
+            font=FONT_SM_BOLD,
+            fg=bg,
+            bg=primary,
             command=self._optimize_all_models
         )
         optimize_btn.pack(pady=10)
         
     def _create_frame_processing_tab(self, parent):
         """Create frame processing controls"""
+        theme = config.CYBERPUNK_THEME
+        bg = theme["bg_color"]
+        primary = theme["primary_color"]
+
         # Frame Processing Section
         frame_opt_frame = tk.LabelFrame(
             parent,
             text="Frame Processing Optimization",
-            font=("Consolas", 12, "bold"),
-            fg=config.CYBERPUNK_THEME["primary_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
+            font=FONT_HEADING,
+            fg=primary,
+            bg=bg
         )
         frame_opt_frame.pack(fill=tk.X, padx=10, pady=10)
         
         # Frame Resize Toggle
-        self.resize_var = tk.BooleanVar(value=config.FRAME_RESIZE_ENABLED)
-        resize_check = tk.Checkbutton(
-            frame_opt_frame,
-            text="Enable Frame Resizing",
-            variable=self.resize_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_frame_resize
-        )
-        resize_check.pack(anchor=tk.W, padx=10, pady=5)
+        resize_spec, *selection_specs = BOOL_SETTINGS_FRAME
+        self._make_bool_setting(frame_opt_frame, *resize_spec)
         
         # Frame Size Controls
-        size_frame = tk.Frame(frame_opt_frame, bg=config.CYBERPUNK_THEME["bg_color"])
+        size_frame = tk.Frame(frame_opt_frame, bg=bg)
         size_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Label(
-            size_frame,
-            text="Resize Width:",
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
-        ).grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(size_frame, text="Resize Width:", style="Cyber.TLabel").grid(row=0, column=0, sticky=tk.W)
         
         self.width_var = tk.IntVar(value=config.FRAME_RESIZE_WIDTH)
         width_spin = tk.Spinbox(
             size_frame,
             from_=320,
             to=1920,
-            increment=32,
+            increment=RESIZE_STRIDE,
             textvariable=self.width_var,
             width=10,
             command=self._update_frame_size
         )
         width_spin.grid(row=0, column=1, padx=(10, 0))
+        self._bind_commit(width_spin, self._update_frame_size)
         
-        tk.Label(
-            size_frame,
-            text="Resize Height:",
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
-        ).grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Label(size_frame, text="Resize Height:", style="Cyber.TLabel").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
         
         self.height_var = tk.IntVar(value=config.FRAME_RESIZE_HEIGHT)
         height_spin = tk.Spinbox(
             size_frame,
-            from_=240,
-            to=1080,
-            increment=24,
+            from_=256,
+            to=1088,
+            increment=RESIZE_STRIDE,
             textvariable=self.height_var,
             width=10,
             command=self._update_frame_size
         )
         height_spin.grid(row=1, column=1, padx=(10, 0), pady=(5, 0))
+        self._bind_commit(height_spin, self._update_frame_size)
         
-        # Smart Frame Selection
-        self.smart_selection_var = tk.BooleanVar(value=config.SMART_FRAME_SELECTION)
-        smart_check = tk.Checkbutton(
-            frame_opt_frame,
-            text="Enable Smart Frame Selection",
-            variable=self.smart_selection_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_smart_selection
-        )
-        smart_check.pack(anchor=tk.W, padx=10, pady=5)
-        
-        # Adaptive Frame Skipping
-        self.adaptive_skip_var = tk.BooleanVar(value=config.ADAPTIVE_SKIP_FRAMES)
-        adaptive_check = tk.Checkbutton(
-            frame_opt_frame,
-            text="Enable Adaptive Frame Skipping",
-            variable=self.adaptive_skip_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_adaptive_skip
+        # Smart Frame Selection / Adaptive Frame Skipping
+        for spec in selection_specs:
+            self._make_bool_setting(frame_opt_frame, *spec)
+        
+        # Manual override for the number of frames reusing the last overlay
+        skip_frame = tk.Frame(frame_opt_frame, bg=bg)
+        skip_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(skip_frame, text="Frames Skipped per Inference (0 = auto):", style="Cyber.TLabel").pack(side=tk.LEFT)
+        
+        self.skip_frames_var = tk.IntVar(value=config.INFER_SKIP_FRAMES)
+        skip_spin = tk.Spinbox(
+            skip_frame,
+            from_=0,
+            to=30,
+            textvariable=self.skip_frames_var,
+            width=10,
+            command=self._update_skip_frames
         )
-        adaptive_check.pack(anchor=tk.W, padx=10, pady=5)
+        skip_spin.pack(side=tk.LEFT, padx=(10, 0))
+        self._bind_commit(skip_spin, self._update_skip_frames)
         
     def _create_performance_monitor_tab(self, parent):
         """Create performance monitoring display"""
+        theme = config.CYBERPUNK_THEME
+        bg = theme["bg_color"]
+        fg = theme["text_color"]
+        primary = theme["primary_color"]
+        button = theme["button_color"]
+        accent = theme["accent_color"]
+
         # Performance Stats
         stats_frame = tk.LabelFrame(
             parent,
             text="Real-time Performance Stats",
-            font=("Consolas", 12, "bold"),
-            fg=config.CYBERPUNK_THEME["primary_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
+            font=FONT_HEADING,
+            fg=primary,
+            bg=bg
         )
         stats_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
@@ -269,65 +365,76 @@ class OptimizationPanel:
         self.stats_text = tk.Text(
             stats_frame,
             height=15,
-            font=("Consolas", 9),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["button_color"],
+            font=FONT_XS,
+            fg=fg,
+            bg=button,
             state=tk.DISABLED
         )
         self.stats_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self._last_stats = None  # New, empty widget
         
         # Refresh button
         refresh_btn = tk.Button(
             stats_frame,
             text="🔄 Refresh Stats",
-            font=("Consolas", 10, "bold"),
-            fg=config.CYBERPUNK_THEME["bg_color"],
-            bg=config.CYBERPUNK_THEME["accent_color"],
+            font=FONT_SM_BOLD,
+            fg=bg,
+            bg=accent,
             command=self._refresh_stats
         )
         refresh_btn.pack(pady=5)
         
+        # Panel log (optimization progress, refresh errors)
+        log_frame = tk.LabelFrame(
+            parent,
+            text="Panel Log",
+            font=FONT_HEADING,
+            fg=primary,
+            bg=bg
+        )
+        log_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self._log_text = tk.Text(
+            log_frame,
+            height=6,
+            font=FONT_XS,
+            fg=fg,
+            bg=button,
+            state=tk.DISABLED
+        )
+        self._log_text.pack(fill=tk.X, padx=10, pady=5)
+        self._render_log()
+        
         # Auto-refresh
         self._refresh_stats()
-        self.optimization_window.after(2000, self._auto_refresh_stats)
+        self._refresh_after_id = self.optimization_window.after(self.STATS_REFRESH_MS, self._auto_refresh_stats)
         
     def _create_advanced_settings_tab(self, parent):
         """Create advanced optimization settings"""
+        theme = config.CYBERPUNK_THEME
+        bg = theme["bg_color"]
+        primary = theme["primary_color"]
+        secondary = theme["secondary_color"]
+
         # Advanced Settings
         advanced_frame = tk.LabelFrame(
             parent,
             text="Advanced Optimization",
-            font=("Consolas", 12, "bold"),
-            fg=config.CYBERPUNK_THEME["primary_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
+            font=FONT_HEADING,
+            fg=primary,
+            bg=bg
         )
         advanced_frame.pack(fill=tk.X, padx=10, pady=10)
         
         # Batch Processing
-        self.batch_var = tk.BooleanVar(value=config.BATCH_PROCESSING)
-        batch_check = tk.Checkbutton(
-            advanced_frame,
-            text="Enable Batch Processing (Experimental)",
-            variable=self.batch_var,
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"],
-            selectcolor=config.CYBERPUNK_THEME["button_color"],
-            command=self._update_batch_processing
-        )
-        batch_check.pack(anchor=tk.W, padx=10, pady=5)
+        for spec in BOOL_SETTINGS_ADV:
+            self._make_bool_setting(advanced_frame, *spec)
         
         # Warm-up iterations
-        warmup_frame = tk.Frame(advanced_frame, bg=config.CYBERPUNK_THEME["bg_color"])
+        warmup_frame = tk.Frame(advanced_frame, bg=bg)
         warmup_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        tk.Label(
-            warmup_frame,
-            text="Model Warm-up Iterations:",
-            font=("Consolas", 10),
-            fg=config.CYBERPUNK_THEME["text_color"],
-            bg=config.CYBERPUNK_THEME["bg_color"]
-        ).pack(side=tk.LEFT)
+        ttk.Label(warmup_frame, text="Model Warm-up Iterations:", style="Cyber.TLabel").pack(side=tk.LEFT)
         
         self.warmup_var = tk.IntVar(value=config.WARM_UP_ITERATIONS)
         warmup_spin = tk.Spinbox(
@@ -339,103 +446,339 @@ class OptimizationPanel:
             command=self._update_warmup
         )
         warmup_spin.pack(side=tk.LEFT, padx=(10, 0))
+        self._bind_commit(warmup_spin, self._update_warmup)
+        
+        # Inference micro-batching
+        infer_batch_frame = tk.Frame(advanced_frame, bg=bg)
+        infer_batch_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(infer_batch_frame, text="Inference Batch Size:", style="Cyber.TLabel").pack(side=tk.LEFT)
+        
+        self.infer_batch_var = tk.IntVar(value=config.INFER_BATCH)
+        infer_batch_spin = tk.Spinbox(
+            infer_batch_frame,
+            from_=1,
+            to=16,
+            textvariable=self.infer_batch_var,
+            width=10,
+            command=self._update_infer_batch
+        )
+        infer_batch_spin.pack(side=tk.LEFT, padx=(10, 0))
+        self._bind_commit(infer_batch_spin, self._update_infer_batch)
+        
+        latency_frame = tk.Frame(advanced_frame, bg=bg)
+        latency_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(latency_frame, text="Batch Flush Timeout (ms):", style="Cyber.TLabel").pack(side=tk.LEFT)
+        
+        self.infer_latency_var = tk.IntVar(value=config.INFER_MAX_LATENCY_MS)
+        latency_spin = tk.Spinbox(
+            latency_frame,
+            from_=5,
+            to=500,
+            increment=5,
+            textvariable=self.infer_latency_var,
+            width=10,
+            command=self._update_infer_batch
+        )
+        latency_spin.pack(side=tk.LEFT, padx=(10, 0))
+        self._bind_commit(latency_spin, self._update_infer_batch)
         
         # Reset optimizations button
         reset_btn = tk.Button(
             advanced_frame,
             text="🔄 Reset All Optimizations",
-            font=("Consolas", 10, "bold"),
-            fg=config.CYBERPUNK_THEME["bg_color"],
-            bg=config.CYBERPUNK_THEME["secondary_color"],
+            font=FONT_SM_BOLD,
+            fg=bg,
+            bg=secondary,
             command=self._reset_optimizations
         )
         reset_btn.pack(pady=10)
         
-    # Event handlers
-    def _update_tensorrt(self):
-        config.ENABLE_TENSORRT = self.tensorrt_var.get()
-        
-    def _update_onnx(self):
-        config.ENABLE_ONNX = self.onnx_var.get()
-        
-    def _update_half_precision(self):
-        config.ENABLE_HALF_PRECISION = self.half_precision_var.get()
+    def apply_hardware_overrides(self):
+        """
+        Force settings the GPU can't use off for this session, without
+        persisting them. FP16 is already CUDA-only at inference, so only a GPU
+        without fast half math needs the switch forced off. Probes torch, so
+        the GUI calls it on the model worker before the first model load.
+        """
+        cuda_available, fast_fp16 = self._probe_gpu_support()
+        if cuda_available and not fast_fp16 and config.ENABLE_HALF_PRECISION:
+            self._probe_overrides["ENABLE_HALF_PRECISION"] = True
+            config.ENABLE_HALF_PRECISION = False
+            print("ℹ️ Half precision (FP16) disabled - no fast FP16 on this GPU")
+        
+    @classmethod
+    def _probe_gpu_support(cls):
+        """
+        (cuda_available, fast_fp16). FP16 only pays off with fast half-precision
+        math: Volta+ (compute capability 7.x and up) or the Pascal P100 (6.0);
+        other Pascal cards run it slower than FP32.
+        """
+        if cls._gpu_support is None:
+            try:
+                import torch  # Deferred: the panel itself doesn't need torch
+                if torch.cuda.is_available():
+                    cc = torch.cuda.get_device_capability(0)
+                    cls._gpu_support = (True, cc[0] >= 7 or cc == (6, 0))
+                else:
+                    cls._gpu_support = (False, False)
+            except ImportError:
+                cls._gpu_support = (False, False)
+        return cls._gpu_support
+        
+    def _make_bool_setting(self, parent, var_name, text, config_key, reload):
+        """Checkbutton bound to a boolean config value (stored on self as var_name)"""
+        var = tk.BooleanVar(value=getattr(config, config_key))
+        setattr(self, var_name, var)
+        check = ttk.Checkbutton(
+            parent,
+            text=text,
+            variable=var,
+            style="Cyber.TCheckbutton",
+            command=lambda: self._schedule_config_update(reload=reload, **{config_key: var.get()})
+        )
+        check.pack(anchor=tk.W, padx=10, pady=5)
+        return check
         
+    # Event handlers
     def _update_precision(self, event=None):
-        config.MODEL_PRECISION = self.precision_var.get()
-        
-    def _update_frame_resize(self):
-        config.FRAME_RESIZE_ENABLED = self.resize_var.get()
+        self._schedule_config_update(MODEL_PRECISION=self.precision_var.get())
+        self._show_int8_settings()
         
-    def _update_frame_size(self):
-        config.FRAME_RESIZE_WIDTH = self.width_var.get()
-        config.FRAME_RESIZE_HEIGHT = self.height_var.get()
+    def _show_int8_settings(self):
+        """Show the calibration controls only while INT8 is selected"""
+        if self.precision_var.get() == "int8":
+            self._int8_frame.pack(fill=tk.X, padx=20, pady=5, after=self._precision_frame)
+        else:
+            self._int8_frame.pack_forget()
         
-    def _update_smart_selection(self):
-        config.SMART_FRAME_SELECTION = self.smart_selection_var.get()
+    def _update_calibration(self, event=None):
+        try:
+            fraction = min(1.0, max(0.1, self.calib_fraction_var.get()))
+        except tk.TclError:
+            return  # Half-typed value; wait for a valid one
+        self._schedule_config_update(TENSORRT_CALIB_DATA=Path(self.calib_data_var.get()),
+                                     TENSORRT_CALIB_FRACTION=fraction)
         
-    def _update_adaptive_skip(self):
-        config.ADAPTIVE_SKIP_FRAMES = self.adaptive_skip_var.get()
+    def _update_frame_size(self, event=None):
+        try:
+            width, height = self.width_var.get(), self.height_var.get()
+        except tk.TclError:
+            return  # Half-typed value; wait for a valid one
+        # Nearest stride multiple (never below one stride)
+        width = max(RESIZE_STRIDE, round(width / RESIZE_STRIDE) * RESIZE_STRIDE)
+        height = max(RESIZE_STRIDE, round(height / RESIZE_STRIDE) * RESIZE_STRIDE)
+        self.width_var.set(width)
+        self.height_var.set(height)
+        self._schedule_config_update(reload=True,
+                                     FRAME_RESIZE_WIDTH=width,
+                                     FRAME_RESIZE_HEIGHT=height)
+        
+    def _update_skip_frames(self, event=None):
+        try:
+            self._schedule_config_update(INFER_SKIP_FRAMES=self.skip_frames_var.get())
+        except tk.TclError:
+            pass  # Not a number (yet)
         
-    def _update_batch_processing(self):
-        config.BATCH_PROCESSING = self.batch_var.get()
+    def _update_warmup(self, event=None):
+        try:
+            self._schedule_config_update(WARM_UP_ITERATIONS=self.warmup_var.get())
+        except tk.TclError:
+            pass
         
-    def _update_warmup(self):
-        config.WARM_UP_ITERATIONS = self.warmup_var.get()
+    def _update_infer_batch(self, event=None):
+        try:
+            self._schedule_config_update(reload=True,
+                                         INFER_BATCH=self.infer_batch_var.get(),
+                                         INFER_MAX_LATENCY_MS=self.infer_latency_var.get())
+        except tk.TclError:
+            pass
+        
+    @staticmethod
+    def _bind_commit(spinbox, handler):
+        """
+        Spinbox command only fires on arrow clicks; also commit typed values
+        on Return and when focus leaves, after typing is finished
+        """
+        spinbox.bind("<Return>", handler)
+        spinbox.bind("<FocusOut>", handler)
+        
+    def _schedule_config_update(self, reload=False, **values):
+        """
+        Queue config values and (re)start the debounce timer, so a burst of
+        changes is written - and frame_processor reloaded - once. Scheduled on
+        the parent so pending values still land if the panel is closed.
+        """
+        self._pending_config.update(values)
+        self._pending_reload = self._pending_reload or reload
+        if self._flush_job is not None:
+            self.parent.after_cancel(self._flush_job)
+        self._flush_job = self.parent.after(self.CONFIG_DEBOUNCE_MS, self._flush_config)
+        
+    def _flush_config(self):
+        """Write the queued config values in one pass"""
+        self._flush_job = None
+        pending, self._pending_config = self._pending_config, {}
+        for name, value in pending.items():
+            setattr(config, name, value)
+        if self._pending_reload:
+            self._pending_reload = False
+            frame_processor.reload_config()
+        if PERSISTED_SETTINGS.intersection(pending):
+            self._save_settings()
         
     def _optimize_all_models(self):
-        """Optimize all available models"""
+        """Optimize all available models on the background worker"""
         try:
+            from model_optimizer import model_optimizer  # Deferred: pulls in torch/ultralytics
             messagebox.showinfo("Optimization", "Starting model optimization...\nThis may take a few minutes.")
-            # This would trigger optimization in the background
-            print("🚀 Starting model optimization...")
+            self._log("🚀 Starting model optimization...")
+            self.optimize_btn.config(state=tk.DISABLED)
+            future = self._executor.submit(model_optimizer.optimize_all_models)
+            # Done callbacks run on the worker; hand the result to the Tk thread
+            future.add_done_callback(lambda f: self.parent.after(0, self._on_optimize_done, f))
         except Exception as e:
             messagebox.showerror("Error", f"Optimization failed: {e}")
             
+    def _on_optimize_done(self, future):
+        """Report the background optimization result (Tk thread)"""
+        if self.optimize_btn is not None and self.optimize_btn.winfo_exists():
+            self.optimize_btn.config(state=tk.NORMAL)
+        error = future.exception()
+        if error is not None:
+            self._log(f"❌ Optimization failed: {error}")
+            messagebox.showerror("Error", f"Optimization failed: {error}")
+            return
+        optimized = [key for key, path in future.result().items()
+                     if path != config.AVAILABLE_MODELS[key].path]
+        self._log(f"✅ Model optimization finished: {len(optimized)} exported")
+        messagebox.showinfo("Optimization", f"Optimization complete.\nExported models: {', '.join(optimized) or 'none'}")
+            
     def _refresh_stats(self):
-        """Refresh performance statistics"""
+        """
+        Refresh performance statistics. Profiler/report errors go to the panel
+        log and count towards the auto-refresh back-off; a Tk error means the
+        widgets are gone, so the refresh chain is shut down.
+        """
         try:
-            # Get performance report
-            perf_report = performance_profiler.get_performance_report()
+            # Get performance report (recomputed only when new samples were recorded)
+            version = performance_profiler.sample_version
+            cached_version, perf_report, bottlenecks = self._perf_cache
+            if version != cached_version:
+                perf_report = performance_profiler.get_performance_report()
+                bottlenecks = performance_profiler.identify_bottlenecks(perf_report)
+                self._perf_cache = (version, perf_report, bottlenecks)
             frame_stats = frame_processor.get_processing_stats()
             
-            # Update stats display
-            self.stats_text.config(state=tk.NORMAL)
-            self.stats_text.delete(1.0, tk.END)
-            
-            stats_text = "=== PERFORMANCE STATISTICS ===\n\n"
+            parts = ["=== PERFORMANCE STATISTICS ===\n\n"]
             
             # Pipeline performance
-            stats_text += "Pipeline Performance:\n"
+            parts.append("Pipeline Performance:\n")
             for operation, stats in perf_report.items():
-                stats_text += f"  {operation}: {stats['avg_ms']:.2f}ms ({stats['fps']:.1f} FPS)\n"
+                parts.append(f"  {operation}: {stats['avg_ms']:.2f}ms ({stats['fps']:.1f} FPS)\n")
             
-            stats_text += "\nFrame Processing:\n"
+            parts.append("\nFrame Processing:\n")
             for key, value in frame_stats.items():
-                stats_text += f"  {key}: {value}\n"
+                parts.append(f"  {key}: {value}\n")
             
             # Bottleneck analysis
-            bottlenecks = performance_profiler.identify_bottlenecks()
             if bottlenecks:
-                stats_text += "\n🚨 Performance Bottlenecks:\n"
+                parts.append("\n🚨 Performance Bottlenecks:\n")
                 for bottleneck in bottlenecks:
-                    stats_text += f"  {bottleneck['operation']}: {bottleneck['avg_ms']:.2f}ms ({bottleneck['severity']})\n"
+                    parts.append(f"  {bottleneck['operation']}: {bottleneck['avg_ms']:.2f}ms ({bottleneck['severity']})\n")
             
+            stats_text = "".join(parts)
+        except Exception as e:
+            self._refresh_failures += 1
+            self._log(f"❌ Profiler error: {e!r}")
+            return
+        self._refresh_failures = 0
+        
+        # Update stats display only when the text changed
+        if stats_text == self._last_stats:
+            return
+        try:
+            self.stats_text.config(state=tk.NORMAL)
+            self.stats_text.delete(1.0, tk.END)
             self.stats_text.insert(1.0, stats_text)
             self.stats_text.config(state=tk.DISABLED)
+        except tk.TclError as e:
+            self._log(f"Stats display error: {e}")
+            self._on_close()
+            return
+        self._last_stats = stats_text
             
-        except Exception as e:
-            print(f"Stats refresh error: {e}")
+    def _log(self, message):
+        """Append a timestamped line to the panel log (Tk thread); bursts render once"""
+        self._log_lines.append(f"{time.strftime('%H:%M:%S')} {message}\n")
+        if not self._log_render_pending and self._log_text is not None and self._log_text.winfo_exists():
+            self._log_render_pending = True
+            self._log_text.after_idle(self._render_log)
+            
+    def _render_log(self):
+        """Show the log ring in its Text pane while the Performance tab is on screen"""
+        self._log_render_pending = False
+        if self._log_text is None or not self._log_text.winfo_exists() or not self._stats_visible():
+            return
+        self._log_text.config(state=tk.NORMAL)
+        self._log_text.delete(1.0, tk.END)
+        self._log_text.insert(1.0, "".join(self._log_lines))
+        self._log_text.see(tk.END)
+        self._log_text.config(state=tk.DISABLED)
+        
+    def _stats_visible(self):
+        """True when the Performance Monitor tab is selected in a non-minimized window"""
+        return (self.notebook.select() == str(self.perf_frame)
+                and self.optimization_window.state() != 'iconic')
+        
+    def _on_tab_changed(self, event=None):
+        """Refresh once on entering the Performance Monitor tab"""
+        if self._stats_visible():
+            self._refresh_stats()
+            self._render_log()
             
     def _auto_refresh_stats(self):
-        """Auto-refresh stats every 2 seconds"""
+        """
+        Auto-refresh stats every 2 seconds while they are on screen. The
+        refresh time is taken out of the next delay, so ticks don't drift;
+        repeated profiler errors stretch the interval up to 8x.
+        """
+        self._refresh_after_id = None
         if self.optimization_window and self.optimization_window.winfo_exists():
-            self._refresh_stats()
-            self.optimization_window.after(2000, self._auto_refresh_stats)
+            start = time.perf_counter()
+            if self._stats_visible():
+                self._refresh_stats()
+            if self.optimization_window is None:
+                return  # Closed by a display error during the refresh
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            interval = self.STATS_REFRESH_MS * min(8, 1 << self._refresh_failures)
+            self._refresh_after_id = self.optimization_window.after(
+                max(250, interval - elapsed_ms), self._auto_refresh_stats)
+            
+    def _on_close(self):
+        """
+        Cancel the pending refresh, destroy the window and drop every widget
+        and Tk variable reference, so reopening builds a fresh tree and the
+        old one can be collected
+        """
+        if self.optimization_window is None:
+            return
+        if self._refresh_after_id is not None:
+            self.optimization_window.after_cancel(self._refresh_after_id)
+            self._refresh_after_id = None
+        self.optimization_window.destroy()
+        
+        for name, value in list(vars(self).items()):
+            if isinstance(value, (tk.Variable, tk.BaseWidget)) and value is not self.parent:
+                setattr(self, name, None)
+        self.optimization_window = None
+        self._last_stats = None
             
     def _reset_optimizations(self):
         """Reset all optimizations to default"""
         if messagebox.askyesno("Reset", "Reset all optimizations to default settings?"):
             frame_processor.reset_optimization()
+            from model_optimizer import model_optimizer  # Deferred: pulls in torch/ultralytics
             model_optimizer.clear_optimization_cache()
             messagebox.showinfo("Reset", "Optimizations reset successfully!")
@@ -23,24 +23,26 @@ class PerformanceMonitor:
         
         # Performance counters
         self.frame_count = 0
-        self.start_time = time.time()
-        self.last_fps_update = time.time()
+        self.start_time = time.monotonic()
+        self.last_fps_update = time.monotonic()
         self.fps_counter = 0
         
         # System info
         self.cpu_count = psutil.cpu_count()
         self.memory_total = psutil.virtual_memory().total / (1024**3)  # GB
         
-        # GPU monitoring (if available)
-        self.gpu_available = self._check_gpu_availability()
+        # GPU monitoring (if available); probing imports torch, so it is left
+        # to check_gpu_availability() off the UI thread
+        self.gpu_available = False
     
-    def _check_gpu_availability(self):
-        """Check if GPU monitoring is available"""
+    def check_gpu_availability(self):
+        """Check if GPU monitoring is available (imports torch) and enable it"""
         try:
             import torch
-            return torch.cuda.is_available()
+            self.gpu_available = torch.cuda.is_available()
         except ImportError:
-            return False
+            self.gpu_available = False
+        return self.gpu_available
     
     def start_monitoring(self):
         """Start performance monitoring"""
@@ -97,7 +99,7 @@ class PerformanceMonitor:
     
     def update_fps(self, inference_time=None):
         """Update FPS counter"""
-        current_time = time.time()
+        current_time = time.monotonic()
         self.frame_count += 1
         self.fps_counter += 1
         
@@ -129,7 +131,7 @@ class PerformanceMonitor:
             'fps': self.get_current_fps(),
             'avg_fps': self.get_average_fps(),
             'total_frames': self.frame_count,
-            'uptime': time.time() - self.start_time,
+            'uptime': time.monotonic() - self.start_time,
             'cpu_usage': self.cpu_usage[-1] if self.cpu_usage else 0,
             'memory_usage': self.memory_usage[-1] if self.memory_usage else 0,
             'gpu_usage': self.gpu_usage[-1] if self.gpu_usage else 0,
@@ -206,8 +208,8 @@ class PerformanceMonitor:
         self.gpu_usage.clear()
         
         self.frame_count = 0
-        self.start_time = time.time()
-        self.last_fps_update = time.time()
+        self.start_time = time.monotonic()
+        self.last_fps_update = time.monotonic()
         self.fps_counter = 0
         
         print("✓ Performance statistics reset")
@@ -224,7 +226,7 @@ class PerformanceMonitor:
             data = {
                 'timestamp': datetime.now().isoformat(),
                 'session_info': {
-                    'uptime': time.time() - self.start_time,
+                    'uptime': time.monotonic() - self.start_time,
                     'total_frames': self.frame_count,
                     'system_info': {
                         'cpu_count': self.cpu_count,
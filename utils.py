@@ -63,22 +63,27 @@ def calculate_box_center(x1, y1, x2, y2):
     center_y = (y1 + y2) / 2
     return center_x, center_y
 
-def resize_frame_for_display(frame, max_width=640, max_height=480):
-    """Resize frame for GUI display while maintaining aspect ratio"""
-    if frame is None:
-        return None
-
-    height, width = frame.shape[:2]
-
+def get_display_size(width, height, max_width=640, max_height=480):
+    """Get (width, height) that fits within max size while maintaining aspect ratio (never upscales)"""
     # Calculate scaling factor
     scale_w = max_width / width
     scale_h = max_height / height
     scale = min(scale_w, scale_h)
 
     if scale < 1:
-        new_width = int(width * scale)
-        new_height = int(height * scale)
-        frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
+        return int(width * scale), int(height * scale)
+    return width, height
+
+def resize_frame_for_display(frame, max_width=640, max_height=480, dst=None):
+    """Resize frame for GUI display while maintaining aspect ratio (into dst if given)"""
+    if frame is None:
+        return None
+
+    height, width = frame.shape[:2]
+    new_size = get_display_size(width, height, max_width, max_height)
+
+    if new_size != (width, height):
+        frame = cv2.resize(frame, new_size, dst=dst, interpolation=cv2.INTER_AREA)
 
     return frame
 
@@ -135,7 +140,7 @@ def get_local_demo_videos():
     for video_dir in video_dirs:
         if os.path.exists(video_dir):
             for file in os.listdir(video_dir):
-                if file.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
+                if os.path.splitext(file)[1].lower() in config.SUPPORTED_FORMATS:
                     demo_videos.append(os.path.join(video_dir, file))
 
     return demo_videos
@@ -0,0 +1,126 @@
+"""
+DivyaDrishti Video Recorder
+Asynchronous auto-record of processed frames to a video file
+"""
+
+import cv2
+import numpy as np
+import queue
+import threading
+import config
+import utils
+from frame_processor import VideoOptimizer, buffer_pool
+
+
+class VideoRecorder:
+    """
+    Encodes frames on a dedicated writer thread. write() only copies the frame
+    into a pooled buffer and queues it, so encoding and disk I/O never run on
+    the detection thread. The queue blocks when full rather than dropping, so
+    recordings stay lossless.
+    """
+
+    def __init__(self, max_queue=None):
+        self.max_queue = max_queue or config.RECORDING_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._armed = False
+        self._fps = config.MAX_FPS
+        self._writer = None
+        self._queue = None
+        self._thread = None
+        self.output_path = None
+
+    def start(self, fps=None):
+        """Arm recording; the file is opened on the first frame (size known)"""
+        with self._lock:
+            self._armed = True
+            if fps:
+                self._fps = fps
+
+    def is_recording(self):
+        """Whether a recording file is currently open"""
+        return self._writer is not None
+
+    def write(self, frame):
+        """Queue a frame for encoding (no-op unless recording is armed)"""
+        with self._lock:
+            if not self._armed:
+                return
+            if self._writer is None and not self._open(frame):
+                self._armed = False
+                return
+            q = self._queue
+
+        buf = buffer_pool.acquire(frame.shape, frame.dtype)
+        np.copyto(buf, frame)
+        q.put(buf)
+
+    def stop(self):
+        """Flush queued frames and close the file"""
+        with self._lock:
+            self._armed = False
+            writer, q, thread = self._writer, self._queue, self._thread
+            self._writer = self._queue = self._thread = None
+
+        if thread is not None:
+            q.put(None)
+            thread.join()
+            writer.release()
+            # Unblock a write() that grabbed the queue just before stop()
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+            print(f"✓ Recording saved: {self.output_path}")
+
+    def _open(self, frame):
+        """Open a writer for the frame size and start the writer thread"""
+        height, width = frame.shape[:2]
+        config.SAVED_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
+        path = config.SAVED_VIDEOS_DIR / f"recording_{utils.get_timestamp()}.mp4"
+
+        writer = self._open_writer(str(path), (width, height))
+        if writer is None:
+            print("✗ Could not open a video writer for recording")
+            return False
+
+        self.output_path = path
+        self._writer = writer
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._thread = threading.Thread(target=self._write_loop,
+                                        args=(writer, self._queue), daemon=True)
+        self._thread.start()
+        print(f"📹 Recording to {path}")
+        return True
+
+    def _open_writer(self, path, size):
+        """Hardware H.264 (GStreamer NVENC) if available, then software codecs"""
+        if config.get_device() == "cuda" and VideoOptimizer._has_gstreamer():
+            pipeline = (f'appsrc ! videoconvert ! nvvidconv ! nvv4l2h264enc ! h264parse ! '
+                        f'mp4mux ! filesink location="{path}"')
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, self._fps, size, True)
+            if writer.isOpened():
+                return writer
+            writer.release()
+
+        for fourcc in (config.RECORDING_FOURCC, "mp4v"):
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), self._fps, size)
+            if writer.isOpened():
+                return writer
+            writer.release()
+        return None
+
+    @staticmethod
+    def _write_loop(writer, q):
+        """Encode queued frames until the None sentinel"""
+        while True:
+            frame = q.get()
+            if frame is None:
+                return
+            try:
+                writer.write(frame)
+            except Exception as e:
+                print(f"✗ Recording write error: {e}")
+            finally:
+                buffer_pool.release(frame)